@@ -4,12 +4,14 @@ Run Telegram scraper to collect messages and images from channels.
 
 Usage:
     python scripts/run_scraper.py --channels CheMed123 lobelia4cosmetics --limit 100
+    python scripts/run_scraper.py --channels CheMed123 --limit 50000 --stream
 """
 
 import argparse
 import asyncio
 import os
 import sys
+from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -45,6 +47,11 @@ async def main():
     parser.add_argument(
         "--data-path", default="data", help="Base path for data lake (default: data)"
     )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream messages to NDJSON as they are fetched instead of buffering",
+    )
 
     args = parser.parse_args()
 
@@ -75,17 +82,39 @@ async def main():
             logger.info(f"📡 Scraping channel: {channel}")
 
             try:
-                # Fetch messages
-                messages = await scraper.get_channel_messages(channel, limit=args.limit)
-
-                if not messages:
+                if args.stream:
+                    # Write each message as it arrives; keep only media
+                    # messages in memory for the optional download step
+                    messages = []
+                    with data_lake.open_message_writer(channel.strip("@")) as writer:
+                        async for record in scraper.iter_channel_messages(
+                            channel, limit=args.limit
+                        ):
+                            writer.write(record)
+                            if record.has_media:
+                                messages.append(record.to_dict())
+                    message_count = writer.count
+                else:
+                    # Fetch messages
+                    messages = await scraper.get_channel_messages(
+                        channel, limit=args.limit
+                    )
+                    message_count = len(messages)
+
+                if not message_count:
                     logger.warning(f"No messages fetched from {channel}")
                     continue
 
-                # Save messages to data lake
-                data_lake.save_message_json(messages, channel.strip("@"))
+                if not args.stream:
+                    # Save messages to data lake
+                    data_lake.save_message_json(messages, channel.strip("@"))
 
-                channel_stats[channel.strip("@")] = len(messages)
+                channel_stats[channel.strip("@")] = message_count
+                data_lake.append_manifest_entry(
+                    datetime.now().strftime("%Y-%m-%d"),
+                    channel.strip("@"),
+                    message_count,
+                )
 
                 # Download media if requested
                 if args.download_media:
@@ -98,8 +127,6 @@ async def main():
 
         # Write manifest
         if channel_stats:
-            from datetime import datetime
-
             date_str = datetime.now().strftime("%Y-%m-%d")
             data_lake.write_manifest(date_str, channel_stats)
 
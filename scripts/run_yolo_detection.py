@@ -19,7 +19,8 @@ from typing import List
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.yolo.yolo_detector import YOLODetector
+from src.yolo.yolo_detector import YOLODetector, effective_precision
+from src.yolo.cache import DetectionCache
 from src.yolo.image_classifier import ImageClassifier
 from src.yolo.detection_manager import DetectionManager
 from src.utils.logger import get_logger
@@ -80,6 +81,23 @@ def main():
         default=0.25,
         help="Confidence threshold (0.0-1.0, default: 0.25)",
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="Images per model call (default: 16)",
+    )
+    parser.add_argument(
+        "--precision",
+        default="fp16",
+        choices=["fp32", "fp16", "int8"],
+        help="Inference precision on GPU (default: fp16)",
+    )
+    parser.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="SQLite file caching detections by image content (default: off)",
+    )
     parser.add_argument(
         "--save-json", action="store_true", help="Also save results as JSON"
     )
@@ -103,22 +121,40 @@ def main():
 
     # Initialize components
     logger.info(f"Loading YOLO model: {args.model}")
-    detector = YOLODetector(model_name=args.model, confidence_threshold=args.confidence)
+    detector = YOLODetector(
+        model_name=args.model,
+        confidence_threshold=args.confidence,
+        batch_size=args.batch_size,
+        precision=args.precision,
+        cache=(
+            DetectionCache(
+                args.cache, args.model, precision=effective_precision(args.precision)
+            )
+            if args.cache
+            else None
+        ),
+    )
+    detector.warmup()
 
     classifier = ImageClassifier()
     manager = DetectionManager()
 
-    # Run detection
-    logger.info("Running object detection...")
-    batch_results = detector.batch_detect(image_paths)
+    # Ensure output directory exists
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Classify images
-    logger.info("Classifying images...")
-    categories = classifier.classify_batch(batch_results)
+    # Run detection; each image is written to the CSV and classified as soon
+    # as it finishes
+    logger.info("Running object detection...")
+    with manager.open_csv_writer(args.output, classifier) as csv_writer:
+        batch_results = detector.batch_detect(
+            image_paths, on_result=csv_writer.write_image
+        )
+    categories = csv_writer.categories
 
     # Get statistics
     det_stats = manager.get_statistics(batch_results)
-    cat_stats = classifier.get_category_statistics(batch_results)
+    cat_stats = classifier.get_statistics_from_categories(categories)
 
     logger.info("\n=== Detection Statistics ===")
     logger.info(f"Total images: {det_stats['total_images']}")
@@ -138,16 +174,6 @@ def main():
     for category, stats in cat_stats.items():
         logger.info(f"  {category}: {stats['count']} ({stats['percentage']:.1f}%)")
 
-    # Save results
-    logger.info(f"\nSaving results to {args.output}")
-
-    # Ensure output directory exists
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # Save CSV
-    manager.save_results_to_csv(batch_results, args.output)
-
     # Save JSON if requested
     if args.save_json:
         json_output = output_path.with_suffix(".json")
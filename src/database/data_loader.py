@@ -189,9 +189,7 @@ class DataLoader:
                 message_id, channel_name, channel_id, message_date, message_text,
                 has_media, media_type, image_path, views, forwards, replies,
                 edit_date, post_author, scraped_at
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-            )
+            ) VALUES %s
             ON CONFLICT (message_id) DO NOTHING
         """
 
@@ -218,7 +216,7 @@ class DataLoader:
             )
 
         try:
-            self.db_connector.execute_many(insert_query, data)
+            self.db_connector.execute_values(insert_query, data)
             self.logger.info(f"Successfully inserted {len(new_messages)} messages")
 
             if existing_ids:
@@ -235,7 +233,7 @@ class DataLoader:
         Load JSON files from data lake to PostgreSQL.
 
         Args:
-            json_path: Path to JSON file or directory containing JSON files
+            json_path: Path to JSON/NDJSON file or directory containing them
             batch_size: Number of records to insert per batch
 
         Returns:
@@ -254,12 +252,12 @@ class DataLoader:
         if not path.exists():
             raise FileNotFoundError(f"Path not found: {json_path}")
 
-        # Collect all JSON files
+        # Collect all JSON and NDJSON (streamed) files
         json_files = []
-        if path.is_file() and path.suffix == ".json":
+        if path.is_file() and path.suffix in (".json", ".jsonl"):
             json_files = [path]
         elif path.is_dir():
-            json_files = list(path.rglob("*.json"))
+            json_files = list(path.rglob("*.json")) + list(path.rglob("*.jsonl"))
         else:
             raise ValueError(f"Invalid path: {json_path}")
 
@@ -274,7 +272,10 @@ class DataLoader:
 
             try:
                 with open(json_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                    if json_file.suffix == ".jsonl":
+                        data = [json.loads(line) for line in f if line.strip()]
+                    else:
+                        data = json.load(f)
 
                 # Handle both single message and list of messages
                 if isinstance(data, dict):
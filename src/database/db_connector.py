@@ -14,16 +14,29 @@ Example:
 
 import os
 import logging
-from typing import Optional, List, Dict, Any
+import weakref
+from typing import Optional, List, Dict, Any, Set
 from contextlib import contextmanager
 import psycopg2
 from psycopg2 import pool, sql, Error
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Hot statements prepared once per pooled connection, keyed by statement name
+PREPARED_STATEMENTS = {
+    "te_exists": """
+        PREPARE te_exists(text, text) AS
+        SELECT EXISTS (
+            SELECT FROM information_schema.tables
+            WHERE table_schema = $1
+            AND table_name = $2
+        )
+    """,
+}
+
 
 class DatabaseConnector:
     """
@@ -38,7 +51,9 @@ class DatabaseConnector:
         database (str): Database name
         user (str): Database user
         password (str): Database password
-        connection_pool: psycopg2 connection pool
+        minconn (int): Connections opened when the pool is created
+        maxconn (int): Upper bound on pooled connections
+        connection_pool: psycopg2 thread-safe connection pool
         logger: Logger instance
 
     Example:
@@ -55,6 +70,9 @@ class DatabaseConnector:
         database: Optional[str] = None,
         user: Optional[str] = None,
         password: Optional[str] = None,
+        minconn: int = 2,
+        maxconn: Optional[int] = None,
+        health_check: bool = False,
     ):
         """
         Initialize DatabaseConnector with connection parameters.
@@ -65,6 +83,11 @@ class DatabaseConnector:
             database: Database name (defaults to POSTGRES_DB env var)
             user: Database user (defaults to POSTGRES_USER env var)
             password: Database password (defaults to POSTGRES_PASSWORD env var)
+            minconn: Connections opened when the pool is created
+            maxconn: Maximum pooled connections (defaults to 2 * CPU cores + 1,
+                which suits I/O-bound workers that mostly wait on the database)
+            health_check: Ping each connection taken from the pool and replace
+                it once if the server dropped it (costs one round-trip)
         """
         self.host = host or os.getenv("POSTGRES_HOST", "localhost")
         self.port = int(port or os.getenv("POSTGRES_PORT", 5432))
@@ -72,16 +95,33 @@ class DatabaseConnector:
         self.user = user or os.getenv("POSTGRES_USER", "warehouse_user")
         self.password = password or os.getenv("POSTGRES_PASSWORD", "")
 
-        self.connection_pool: Optional[pool.SimpleConnectionPool] = None
+        self.minconn = minconn
+        self.maxconn = maxconn or 2 * (os.cpu_count() or 1) + 1
+        self._health_check = health_check
+
+        self.connection_pool: Optional[pool.ThreadedConnectionPool] = None
         self.logger = logging.getLogger(__name__)
 
-    def connect(self, min_connections: int = 1, max_connections: int = 10) -> None:
+        # Statement names already prepared on each live connection
+        self._prepared: "weakref.WeakKeyDictionary[Any, Set[str]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def connect(
+        self,
+        min_connections: Optional[int] = None,
+        max_connections: Optional[int] = None,
+    ) -> None:
         """
         Establish connection pool to PostgreSQL database.
 
+        The pool is thread-safe, so worker threads can share one connector.
+
         Args:
             min_connections: Minimum number of connections in pool
+                (defaults to self.minconn)
             max_connections: Maximum number of connections in pool
+                (defaults to self.maxconn)
 
         Raises:
             psycopg2.Error: If connection fails
@@ -91,9 +131,9 @@ class DatabaseConnector:
                 f"Connecting to PostgreSQL database at {self.host}:{self.port}"
             )
 
-            self.connection_pool = pool.SimpleConnectionPool(
-                min_connections,
-                max_connections,
+            self.connection_pool = pool.ThreadedConnectionPool(
+                self.minconn if min_connections is None else min_connections,
+                self.maxconn if max_connections is None else max_connections,
                 host=self.host,
                 port=self.port,
                 database=self.database,
@@ -113,10 +153,18 @@ class DatabaseConnector:
             raise
 
     @contextmanager
-    def get_connection(self):
+    def get_connection(self, cursor_factory=None):
         """
         Context manager for database connections.
 
+        With health_check enabled, a connection that fails a SELECT 1 ping
+        is discarded and one fresh connection is taken instead.
+
+        Args:
+            cursor_factory: Cursor class used by conn.cursor() while the
+                connection is checked out (e.g. RealDictCursor); the
+                connection's own default is restored on return to the pool
+
         Yields:
             psycopg2.connection: Database connection
 
@@ -131,11 +179,35 @@ class DatabaseConnector:
             )
 
         conn = self.connection_pool.getconn()
+        if self._health_check and not self._is_alive(conn):
+            self.logger.warning("Discarding dead pooled connection")
+            self.connection_pool.putconn(conn, close=True)
+            conn = self.connection_pool.getconn()
+
+        previous_factory = None
+        if cursor_factory is not None:
+            previous_factory = conn.cursor_factory
+            conn.cursor_factory = cursor_factory
+
         try:
             yield conn
         finally:
+            if cursor_factory is not None:
+                conn.cursor_factory = previous_factory
             self.connection_pool.putconn(conn)
 
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        """Return whether conn is open and answers a trivial query."""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
     def create_schemas(self, schemas: Optional[List[str]] = None) -> None:
         """
         Create database schemas if they don't exist.
@@ -149,17 +221,19 @@ class DatabaseConnector:
         if schemas is None:
             schemas = ["raw", "staging", "marts"]
 
+        # One round-trip, committed together
+        statement = sql.SQL("; ").join(
+            sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(schema))
+            for schema in schemas
+        )
+
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    for schema in schemas:
-                        cursor.execute(
-                            sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(
-                                sql.Identifier(schema)
-                            )
-                        )
-                        self.logger.info(f"Schema '{schema}' created or already exists")
+                    cursor.execute(statement)
                 conn.commit()
+                for schema in schemas:
+                    self.logger.info(f"Schema '{schema}' created or already exists")
 
         except Error as e:
             self.logger.error(f"Failed to create schemas: {e}")
@@ -192,8 +266,8 @@ class DatabaseConnector:
             ... )
         """
         try:
-            with self.get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            with self.get_connection(cursor_factory=RealDictCursor) as conn:
+                with conn.cursor() as cursor:
                     cursor.execute(query, params)
 
                     if fetch:
@@ -208,13 +282,18 @@ class DatabaseConnector:
             self.logger.error(f"Query: {query}")
             raise
 
-    def execute_many(self, query: str, data: List[tuple]) -> None:
+    def execute_many(self, query: str, data: List[tuple], page_size: int = 500) -> None:
         """
         Execute a query with multiple parameter sets (bulk insert).
 
+        Parameter sets are sent page_size at a time instead of one round-trip
+        per row. For plain INSERTs prefer execute_values, which also folds
+        each page into a single statement.
+
         Args:
             query: SQL query with placeholders
             data: List of parameter tuples
+            page_size: Number of parameter sets sent per round-trip
 
         Raises:
             psycopg2.Error: If execution fails
@@ -228,7 +307,38 @@ class DatabaseConnector:
         try:
             with self.get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.executemany(query, data)
+                    execute_batch(cursor, query, data, page_size=page_size)
+                conn.commit()
+                self.logger.info(f"Bulk insert completed: {len(data)} rows")
+
+        except Error as e:
+            self.logger.error(f"Bulk insert failed: {e}")
+            raise
+
+    def execute_values(
+        self, query: str, data: List[tuple], page_size: int = 500
+    ) -> None:
+        """
+        Insert many rows with one multi-row VALUES statement per page.
+
+        Args:
+            query: SQL with a single "VALUES %s" placeholder
+            data: List of row tuples
+            page_size: Number of rows folded into each statement
+
+        Raises:
+            psycopg2.Error: If execution fails
+
+        Example:
+            >>> db.execute_values(
+            ...     "INSERT INTO table (col1, col2) VALUES %s",
+            ...     [("val1", "val2"), ("val3", "val4")]
+            ... )
+        """
+        try:
+            with self.get_connection() as conn:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, query, data, page_size=page_size)
                 conn.commit()
                 self.logger.info(f"Bulk insert completed: {len(data)} rows")
 
@@ -236,10 +346,30 @@ class DatabaseConnector:
             self.logger.error(f"Bulk insert failed: {e}")
             raise
 
+    def _ensure_prepared(self, conn, name: str) -> None:
+        """
+        Prepare a statement from PREPARED_STATEMENTS on conn if not done yet.
+
+        Prepared statements live for the database session, so they survive
+        the connection being returned to and taken from the pool.
+
+        Args:
+            conn: Pooled psycopg2 connection
+            name: Key into PREPARED_STATEMENTS
+        """
+        prepared = self._prepared.setdefault(conn, set())
+        if name not in prepared:
+            with conn.cursor() as cursor:
+                cursor.execute(PREPARED_STATEMENTS[name])
+            prepared.add(name)
+
     def table_exists(self, table_name: str, schema: str = "public") -> bool:
         """
         Check if a table exists in the database.
 
+        Runs a statement prepared once per connection, so repeated checks
+        skip parsing and planning.
+
         Args:
             table_name: Name of the table
             schema: Schema name (default: public)
@@ -247,15 +377,19 @@ class DatabaseConnector:
         Returns:
             True if table exists, False otherwise
         """
-        query = """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = %s 
-                AND table_name = %s
-            );
-        """
         try:
-            result = self.execute_query(query, params=(schema, table_name))
+            with self.get_connection(cursor_factory=RealDictCursor) as conn:
+                try:
+                    self._ensure_prepared(conn, "te_exists")
+                    with conn.cursor() as cursor:
+                        cursor.execute(
+                            "EXECUTE te_exists(%s, %s)", (schema, table_name)
+                        )
+                        result = cursor.fetchall()
+                finally:
+                    # End the read transaction (the prepared statement is
+                    # session-level and survives) so the pool gets it back idle
+                    conn.rollback()
             return result[0]["exists"] if result else False
         except Error as e:
             self.logger.error(f"Error checking table existence: {e}")
@@ -267,4 +401,5 @@ class DatabaseConnector:
         """
         if self.connection_pool:
             self.connection_pool.closeall()
+            self._prepared.clear()
             self.logger.info("Database connection pool closed")
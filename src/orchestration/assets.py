@@ -210,8 +210,9 @@ def enriched_data(context: AssetExecutionContext) -> Dict[str, Any]:
             "timestamp": datetime.now().isoformat(),
         }
 
-    # Output paths
+    # Output paths; the script writes the category summary next to the CSV
     output_csv = PROJECT_ROOT / "data" / "processed" / "yolo_detections_dagster.csv"
+    categories_csv = output_csv.parent / "image_categories.csv"
 
     try:
         result = subprocess.run(
@@ -237,19 +238,29 @@ def enriched_data(context: AssetExecutionContext) -> Dict[str, Any]:
 
         # Read detection results if CSV exists
         if output_csv.exists():
+            # The detections CSV only has rows for images with detections;
+            # every processed image gets one row in the category summary
             df = pd.read_csv(output_csv)
-            images_processed = (
+            images_with_detections = (
                 df["image_path"].nunique() if "image_path" in df.columns else 0
             )
+            images_processed = (
+                len(pd.read_csv(categories_csv))
+                if categories_csv.exists()
+                else images_with_detections
+            )
             total_detections = len(df)
 
             context.log.info(
-                f"Processed {images_processed} images, found {total_detections} detections"
+                f"Processed {images_processed} images, "
+                f"{images_with_detections} with detections, "
+                f"found {total_detections} detections"
             )
 
             return {
                 "status": "success",
                 "images_processed": images_processed,
+                "images_with_detections": images_with_detections,
                 "total_detections": total_detections,
                 "output_file": str(output_csv),
                 "timestamp": datetime.now().isoformat(),
@@ -10,15 +10,95 @@ Example:
     >>> path = dlm.save_message_json(messages, "CheMed123", "2026-01-18")
 """
 
-import json
+import logging
 import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from src.utils.json_io import dump_json_bytes, load_json_bytes
 from src.utils.logger import get_logger
 
 
+def _write_bytes(file_path: Path, payload: bytes, fsync: bool = False) -> None:
+    """Write payload to file_path through a raw fd, bypassing TextIOWrapper."""
+    fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class MessageWriter:
+    """
+    NDJSON writer for streaming messages to the data lake.
+
+    Each message is encoded as one JSON line and written through a 1 MiB
+    buffer, so memory stays bounded regardless of how many messages are
+    streamed. Lines go to a temporary file that replaces file_path when the
+    writer closes cleanly, so re-running a channel and date overwrites the
+    earlier file, as save_message_json does, and a failed run leaves it
+    untouched. Use DataLakeManager.open_message_writer to create one.
+
+    Attributes:
+        file_path: Path of the NDJSON file being written
+        count: Number of messages written so far
+
+    Example:
+        >>> with dlm.open_message_writer("CheMed123") as writer:
+        ...     writer.write({"message_id": 1, "message_text": "Hello"})
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, file_path: Path, logger: logging.Logger):
+        """
+        Initialize MessageWriter.
+
+        Args:
+            file_path: Path of the NDJSON file to write
+            logger: Logger instance used to report the final count
+        """
+        self.file_path = file_path
+        self.count = 0
+        self.logger = logger
+        self._tmp_path = file_path.with_name(file_path.name + ".tmp")
+        self._file = None
+
+    def __enter__(self) -> "MessageWriter":
+        """Open a fresh temporary file next to file_path."""
+        self._file = open(self._tmp_path, "wb", buffering=self.BUFFER_SIZE)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Close the file and move it into place, or discard it on error."""
+        self._file.close()
+        self._file = None
+        if exc_type is not None:
+            self._tmp_path.unlink(missing_ok=True)
+            return
+
+        os.replace(self._tmp_path, self.file_path)
+        self.logger.info(f"Streamed {self.count} messages to {self.file_path}")
+
+    def write(self, message: Any) -> None:
+        """
+        Write one message.
+
+        Args:
+            message: Message dictionary, or any record exposing to_dict()
+        """
+        if not isinstance(message, dict):
+            message = message.to_dict()
+        self._file.write(dump_json_bytes(message, newline=True))
+        self.count += 1
+
+
 class DataLakeManager:
     """
     Manages data lake structure and file operations.
@@ -29,7 +109,9 @@ class DataLakeManager:
         │   ├── telegram_messages/
         │   │   └── YYYY-MM-DD/
         │   │       ├── channel_name.json
-        │   │       └── _manifest.json
+        │   │       ├── channel_name.jsonl (streamed)
+        │   │       ├── _manifest.json
+        │   │       └── _manifest.wal (pending entries)
         │   └── images/
         │       └── channel_name/
         │           └── message_id.jpg
@@ -130,8 +212,7 @@ class DataLakeManager:
         file_path = partition_dir / f"{channel_name}.json"
 
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(messages, f, ensure_ascii=False, indent=2)
+            _write_bytes(file_path, dump_json_bytes(messages, indent=True))
 
             self.logger.info(
                 f"Saved {len(messages)} messages to {file_path.relative_to(self.base_path)}"
@@ -142,6 +223,91 @@ class DataLakeManager:
             self.logger.error(f"Failed to save messages: {e}")
             raise IOError(f"Failed to write to {file_path}: {e}")
 
+    def open_message_writer(
+        self, channel_name: str, date_str: Optional[str] = None
+    ) -> MessageWriter:
+        """
+        Open an NDJSON writer for streaming messages into a partition.
+
+        Messages are written to channel_name.jsonl, one JSON object per line,
+        replacing any file from an earlier run.
+
+        Args:
+            channel_name: Name of Telegram channel
+            date_str: Date string (default: today in YYYY-MM-DD)
+
+        Returns:
+            MessageWriter to be used as a context manager
+
+        Example:
+            >>> with dlm.open_message_writer("CheMed123") as writer:
+            ...     async for record in scraper.iter_channel_messages("CheMed123"):
+            ...         writer.write(record)
+        """
+        if date_str is None:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+
+        partition_dir = self.get_messages_partition_dir(date_str)
+        return MessageWriter(partition_dir / f"{channel_name}.jsonl", self.logger)
+
+    def save_message_parquet(
+        self,
+        columns: Dict[str, List[Any]],
+        channel_name: str,
+        date_str: Optional[str] = None,
+    ) -> Path:
+        """
+        Save columnar messages as a Parquet file in partitioned structure.
+
+        Args:
+            columns: Mapping of field name to list of values, as returned by
+                TelegramScraper.get_channel_messages(..., output="columns")
+            channel_name: Name of Telegram channel
+            date_str: Date string (default: today in YYYY-MM-DD)
+
+        Returns:
+            Path to saved Parquet file
+
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If columns contain no messages
+            IOError: If file write fails
+
+        Example:
+            >>> columns = {"message_id": [1, 2], "message_text": ["Hi", "Bye"]}
+            >>> path = dlm.save_message_parquet(columns, "CheMed123")
+        """
+        if not columns or not any(columns.values()):
+            raise ValueError("Messages list cannot be empty")
+
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                f"Required package not installed: {e}. "
+                "Install with: pip install pyarrow"
+            )
+
+        if date_str is None:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+
+        partition_dir = self.get_messages_partition_dir(date_str)
+        file_path = partition_dir / f"{channel_name}.parquet"
+
+        try:
+            table = pa.Table.from_pydict(columns)
+            pq.write_table(table, file_path)
+
+            self.logger.info(
+                f"Saved {table.num_rows} messages to {file_path.relative_to(self.base_path)}"
+            )
+            return file_path
+
+        except Exception as e:
+            self.logger.error(f"Failed to save messages: {e}")
+            raise IOError(f"Failed to write to {file_path}: {e}")
+
     def save_image(
         self,
         image_data: bytes,
@@ -183,6 +349,62 @@ class DataLakeManager:
             self.logger.error(f"Failed to save image {message_id}: {e}")
             raise IOError(f"Failed to write image to {file_path}: {e}")
 
+    def append_manifest_entry(
+        self, date_str: str, channel_name: str, message_count: int
+    ) -> Path:
+        """
+        Durably record one channel's message count in the partition's WAL.
+
+        Each call appends a single NDJSON line to _manifest.wal and fsyncs it,
+        so progress survives a crash mid-scrape. write_manifest folds the
+        pending entries into _manifest.json.
+
+        Args:
+            date_str: Date string in YYYY-MM-DD format
+            channel_name: Name of Telegram channel
+            message_count: Number of messages scraped for the channel
+
+        Returns:
+            Path to the WAL file
+
+        Example:
+            >>> dlm.append_manifest_entry("2026-01-18", "CheMed123", 150)
+        """
+        partition_dir = self.get_messages_partition_dir(date_str)
+        wal_path = partition_dir / "_manifest.wal"
+
+        entry = {
+            "channel": channel_name,
+            "count": message_count,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+        with open(wal_path, "ab", buffering=4096) as f:
+            f.write(dump_json_bytes(entry, newline=True))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.logger.debug(f"Appended manifest entry for {channel_name} ({date_str})")
+        return wal_path
+
+    def _read_manifest_wal(self, wal_path: Path) -> Dict[str, int]:
+        """Replay WAL entries into channel counts, ignoring a torn last line."""
+        channels: Dict[str, int] = {}
+        if not wal_path.exists():
+            return channels
+
+        with open(wal_path, "rb") as f:
+            for line in f:
+                try:
+                    entry = load_json_bytes(line)
+                except ValueError:
+                    self.logger.warning(
+                        f"Skipping corrupt manifest WAL entry in {wal_path}"
+                    )
+                    continue
+                channels[entry["channel"]] = entry["count"]
+        return channels
+
     def write_manifest(
         self,
         date_str: str,
@@ -192,6 +414,10 @@ class DataLakeManager:
         """
         Write manifest file with scraping metadata.
 
+        Channel counts from the existing manifest and from pending WAL entries
+        (see append_manifest_entry) are merged with channel_stats, which takes
+        precedence. The manifest is replaced atomically and the WAL is removed.
+
         Args:
             date_str: Date string in YYYY-MM-DD format
             channel_stats: Dictionary of channel_name -> message_count
@@ -206,19 +432,33 @@ class DataLakeManager:
         """
         partition_dir = self.get_messages_partition_dir(date_str)
         manifest_path = partition_dir / "_manifest.json"
+        wal_path = partition_dir / "_manifest.wal"
+
+        channels: Dict[str, int] = {}
+        if manifest_path.exists():
+            channels.update(
+                load_json_bytes(manifest_path.read_bytes()).get("channels", {})
+            )
+        channels.update(self._read_manifest_wal(wal_path))
+        channels.update(channel_stats)
 
         manifest = {
             "date": date_str,
             "timestamp": datetime.now().isoformat(),
-            "channels": channel_stats,
-            "total_messages": sum(channel_stats.values()),
+            "channels": channels,
+            "total_messages": sum(channels.values()),
         }
 
         if extra:
             manifest.update(extra)
 
-        with open(manifest_path, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        tmp_path = partition_dir / "_manifest.json.tmp"
+        _write_bytes(tmp_path, dump_json_bytes(manifest, indent=True), fsync=True)
+        os.replace(tmp_path, manifest_path)
+
+        # Entries are now part of the manifest; replaying them again is
+        # harmless, so a crash before this unlink is safe
+        wal_path.unlink(missing_ok=True)
 
         self.logger.info(f"Wrote manifest: {manifest_path.relative_to(self.base_path)}")
         return manifest_path
@@ -234,12 +474,14 @@ class DataLakeManager:
         if not messages_dir.exists():
             return []
 
-        dates = [
-            d.name
-            for d in messages_dir.iterdir()
-            if d.is_dir() and not d.name.startswith("_")
-        ]
-        return sorted(dates)
+        # DirEntry.is_dir() reuses the dirent type, avoiding a stat() per entry
+        with os.scandir(messages_dir) as entries:
+            return sorted(
+                entry.name
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and not entry.name.startswith("_")
+            )
 
     def validate_structure(self) -> bool:
         """
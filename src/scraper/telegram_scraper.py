@@ -14,9 +14,10 @@ Example:
 
 import asyncio
 import os
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError
@@ -24,6 +25,95 @@ from telethon.tl.types import MessageMediaPhoto
 
 from src.utils.logger import get_logger
 
+# Messages returned by a single Telegram GetHistory call in iter_messages
+MESSAGES_PER_REQUEST = 100
+
+# Field order of a scraped message record
+MESSAGE_FIELDS = (
+    "message_id",
+    "channel_name",
+    "channel_title",
+    "message_date",
+    "message_text",
+    "has_media",
+    "views",
+    "forwards",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class MessageRecord:
+    """
+    Immutable, slotted record for a single scraped message.
+
+    Uses __slots__ instead of a per-instance __dict__, so a record costs a
+    fraction of the equivalent message dictionary.
+
+    Example:
+        >>> records = await scraper.get_channel_messages("CheMed123", output="records")
+        >>> print(records[0].message_text)
+    """
+
+    message_id: int
+    channel_name: str
+    channel_title: str
+    message_date: Optional[str]
+    message_text: str
+    has_media: bool
+    views: int
+    forwards: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the record as a message dictionary."""
+        return {field: getattr(self, field) for field in MESSAGE_FIELDS}
+
+
+def to_records(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert columnar messages (dict of parallel lists) to a list of dicts.
+
+    Args:
+        columns: Mapping of field name to list of values, as returned by
+            get_channel_messages(..., output="columns")
+
+    Returns:
+        List of message dictionaries
+
+    Example:
+        >>> columns = await scraper.get_channel_messages("CheMed123", output="columns")
+        >>> messages = to_records(columns)
+    """
+    fields = list(columns)
+    return [dict(zip(fields, values)) for values in zip(*columns.values())]
+
+
+class _PooledBuffer:
+    """
+    Reusable, file-like byte buffer that media downloads are written into.
+
+    Telethon accepts any object with a write() method as a download target,
+    so chunks land in a preallocated bytearray instead of a fresh bytes
+    object per image.
+    """
+
+    def __init__(self, size: int):
+        self.data = bytearray(size)
+        self.length = 0
+
+    def write(self, chunk: bytes) -> int:
+        end = self.length + len(chunk)
+        if end > len(self.data):
+            self.data.extend(bytes(end - len(self.data)))
+        self.data[self.length : end] = chunk
+        self.length = end
+        return len(chunk)
+
+    def reset(self) -> None:
+        self.length = 0
+
+    def view(self) -> memoryview:
+        return memoryview(self.data)[: self.length]
+
 
 class TelegramScraper:
     """
@@ -49,6 +139,8 @@ class TelegramScraper:
         api_hash: str,
         phone: str,
         session_name: str = "scraper_session",
+        download_buffers: int = 8,
+        download_buffer_size: int = 2 * 1024 * 1024,
     ):
         """
         Initialize Telegram scraper.
@@ -58,6 +150,8 @@ class TelegramScraper:
             api_hash: Telegram API hash
             phone: Phone number with country code (e.g., "+1234567890")
             session_name: Session file name (default: "scraper_session")
+            download_buffers: Number of reusable media download buffers (default: 8)
+            download_buffer_size: Initial size of each buffer in bytes (default: 2 MiB)
 
         Raises:
             ValueError: If credentials are invalid
@@ -70,6 +164,9 @@ class TelegramScraper:
         self.phone = phone
         self.session_name = session_name
         self.client: Optional[TelegramClient] = None
+        self.download_buffers = download_buffers
+        self.download_buffer_size = download_buffer_size
+        self._buffer_pool: Optional[asyncio.Queue] = None
         self.logger = get_logger(__name__)
 
         self.logger.info(f"Initialized TelegramScraper with session: {session_name}")
@@ -106,46 +203,46 @@ class TelegramScraper:
             await self.client.disconnect()
             self.logger.info("Disconnected from Telegram")
 
-    async def get_channel_messages(
+    async def iter_channel_messages(
         self,
         channel: str,
         limit: int = 100,
         message_delay: float = 0.5,
         max_retries: int = 3,
-    ) -> List[Dict[str, Any]]:
+    ) -> AsyncIterator[MessageRecord]:
         """
-        Fetch messages from a Telegram channel.
+        Stream messages from a Telegram channel one record at a time.
+
+        Unlike get_channel_messages, nothing is buffered, so callers can write
+        each message to disk while the next page is still being fetched. After
+        a rate-limit wait the iteration resumes from the last yielded message
+        instead of starting over.
 
         Args:
             channel: Channel username (with or without @)
             limit: Maximum number of messages to fetch (default: 100)
-            message_delay: Delay between message fetches in seconds (default: 0.5)
+            message_delay: Delay after each page of MESSAGES_PER_REQUEST
+                messages in seconds (default: 0.5)
             max_retries: Maximum retry attempts on rate limit (default: 3)
 
-        Returns:
-            List of message dictionaries with fields:
-                - message_id: Unique message identifier
-                - channel_name: Channel username (without @)
-                - channel_title: Channel display title
-                - message_date: ISO format timestamp
-                - message_text: Message content
-                - has_media: Boolean indicating media presence
-                - views: View count
-                - forwards: Forward count
+        Yields:
+            MessageRecord for each fetched message
 
         Raises:
             ValueError: If channel doesn't exist or is inaccessible
             FloodWaitError: If rate limited by Telegram
 
         Example:
-            >>> messages = await scraper.get_channel_messages("CheMed123", limit=50)
-            >>> print(f"Fetched {len(messages)} messages")
+            >>> with dlm.open_message_writer("CheMed123") as writer:
+            ...     async for record in scraper.iter_channel_messages("CheMed123"):
+            ...         writer.write(record)
         """
         if not self.client:
             raise ConnectionError("Client not connected. Call connect() first.")
 
         channel_name = channel.strip("@")
-        messages = []
+        fetched = 0
+        last_id = 0
         retries = 0
 
         while retries <= max_retries:
@@ -158,31 +255,32 @@ class TelegramScraper:
                     f"Fetching messages from {channel_name} (limit={limit})"
                 )
 
-                # Iterate through messages
-                async for message in self.client.iter_messages(entity, limit=limit):
-                    message_dict = {
-                        "message_id": message.id,
-                        "channel_name": channel_name,
-                        "channel_title": channel_title,
-                        "message_date": (
+                # Resume below the last yielded message after a retry
+                async for message in self.client.iter_messages(
+                    entity, limit=limit - fetched, offset_id=last_id
+                ):
+                    fetched += 1
+                    last_id = message.id
+                    yield MessageRecord(
+                        message_id=message.id,
+                        channel_name=channel_name,
+                        channel_title=channel_title,
+                        message_date=(
                             message.date.isoformat() if message.date else None
                         ),
-                        "message_text": message.message or "",
-                        "has_media": message.media is not None,
-                        "views": message.views or 0,
-                        "forwards": message.forwards or 0,
-                    }
-
-                    messages.append(message_dict)
+                        message_text=message.message or "",
+                        has_media=message.media is not None,
+                        views=message.views or 0,
+                        forwards=message.forwards or 0,
+                    )
 
-                    # Rate limiting
-                    if message_delay > 0:
+                    # Rate limiting: iter_messages fetches a page per API
+                    # call, so pause once per page rather than per message
+                    if message_delay > 0 and fetched % MESSAGES_PER_REQUEST == 0:
                         await asyncio.sleep(message_delay)
 
-                self.logger.info(
-                    f"✅ Fetched {len(messages)} messages from {channel_name}"
-                )
-                return messages
+                self.logger.info(f"✅ Fetched {fetched} messages from {channel_name}")
+                return
 
             except FloodWaitError as e:
                 wait_seconds = getattr(e, "seconds", 60)
@@ -203,7 +301,85 @@ class TelegramScraper:
                 self.logger.error(f"Error fetching messages from {channel_name}: {e}")
                 raise ValueError(f"Failed to fetch from {channel}: {e}")
 
-        return messages
+    async def get_channel_messages(
+        self,
+        channel: str,
+        limit: int = 100,
+        message_delay: float = 0.5,
+        max_retries: int = 3,
+        output: str = "dicts",
+    ) -> Union[List[Dict[str, Any]], Dict[str, List[Any]], List[MessageRecord]]:
+        """
+        Fetch messages from a Telegram channel.
+
+        Args:
+            channel: Channel username (with or without @)
+            limit: Maximum number of messages to fetch (default: 100)
+            message_delay: Delay after each page of MESSAGES_PER_REQUEST
+                messages in seconds (default: 0.5)
+            max_retries: Maximum retry attempts on rate limit (default: 3)
+            output: Result shape - "dicts" for a list of dicts, "columns" for a
+                dict of parallel lists keyed by field name, or "records" for a
+                list of MessageRecord objects (default: "dicts")
+
+        Returns:
+            Messages in the requested shape, with fields:
+                - message_id: Unique message identifier
+                - channel_name: Channel username (without @)
+                - channel_title: Channel display title
+                - message_date: ISO format timestamp
+                - message_text: Message content
+                - has_media: Boolean indicating media presence
+                - views: View count
+                - forwards: Forward count
+
+        Raises:
+            ValueError: If channel doesn't exist or is inaccessible, or if
+                output is not a supported shape
+            FloodWaitError: If rate limited by Telegram
+
+        Example:
+            >>> messages = await scraper.get_channel_messages("CheMed123", limit=50)
+            >>> print(f"Fetched {len(messages)} messages")
+        """
+        if output not in ("dicts", "columns", "records"):
+            raise ValueError(f"Unsupported output shape: {output}")
+
+        rows = [
+            record
+            async for record in self.iter_channel_messages(
+                channel, limit, message_delay, max_retries
+            )
+        ]
+        return self._shape_messages(rows, output)
+
+    @staticmethod
+    def _shape_messages(
+        rows: List[MessageRecord], output: str
+    ) -> Union[List[Dict[str, Any]], Dict[str, List[Any]], List[MessageRecord]]:
+        """Build the requested output shape from message records."""
+        if output == "records":
+            return rows
+        if output == "columns":
+            return {
+                field: [getattr(row, field) for row in rows] for field in MESSAGE_FIELDS
+            }
+        return [row.to_dict() for row in rows]
+
+    async def _acquire_buffer(self) -> _PooledBuffer:
+        """Take a download buffer from the pool, creating the pool on first use."""
+        if self._buffer_pool is None:
+            self._buffer_pool = asyncio.Queue()
+            for _ in range(self.download_buffers):
+                self._buffer_pool.put_nowait(_PooledBuffer(self.download_buffer_size))
+
+        buffer = await self._buffer_pool.get()
+        buffer.reset()
+        return buffer
+
+    def _release_buffer(self, buffer: _PooledBuffer) -> None:
+        """Return a download buffer to the pool."""
+        self._buffer_pool.put_nowait(buffer)
 
     async def download_media(
         self, message_id: int, channel: str, output_path: Path, max_retries: int = 3
@@ -249,8 +425,15 @@ class TelegramScraper:
                 # Ensure output directory exists
                 output_path.parent.mkdir(parents=True, exist_ok=True)
 
-                # Download media
-                await self.client.download_media(message.media, str(output_path))
+                # Download media into a pooled buffer, then write it out
+                buffer = await self._acquire_buffer()
+                try:
+                    await self.client.download_media(message.media, file=buffer)
+                    with open(output_path, "wb") as f, buffer.view() as view:
+                        f.write(view)
+                finally:
+                    self._release_buffer(buffer)
+
                 self.logger.debug(f"Downloaded media: {output_path}")
                 return output_path
 
@@ -279,6 +462,9 @@ class TelegramScraper:
         """
         Download all media from a list of messages.
 
+        Images already present in output_dir from a previous run (non-empty
+        message_id.jpg) are not downloaded again.
+
         Args:
             messages: List of message dictionaries (from get_channel_messages)
             output_dir: Base directory for saving images
@@ -304,10 +490,26 @@ class TelegramScraper:
             f"Downloading {len(media_messages)} images from {channel_name}"
         )
 
+        # One directory scan instead of an exists() check per message
+        existing = set()
+        if output_dir.is_dir():
+            with os.scandir(output_dir) as entries:
+                existing = {
+                    entry.name
+                    for entry in entries
+                    if entry.name.endswith(".jpg") and entry.stat().st_size > 0
+                }
+
+        skipped = 0
         for msg in media_messages:
             message_id = msg["message_id"]
             output_path = output_dir / f"{message_id}.jpg"
 
+            if output_path.name in existing:
+                results[message_id] = output_path
+                skipped += 1
+                continue
+
             path = await self.download_media(message_id, channel_name, output_path)
             results[message_id] = path
 
@@ -317,6 +519,7 @@ class TelegramScraper:
         success_count = sum(1 for p in results.values() if p is not None)
         self.logger.info(
             f"Downloaded {success_count}/{len(media_messages)} images from {channel_name}"
+            f" ({skipped} already on disk)"
         )
 
         return results
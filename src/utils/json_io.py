@@ -0,0 +1,59 @@
+"""
+JSON encoding to and from UTF-8 bytes.
+
+Uses orjson when it is installed and falls back to the standard library
+json module otherwise; both produce the same output.
+
+Example:
+    >>> from src.utils.json_io import dump_json_bytes, load_json_bytes
+    >>> data = dump_json_bytes({"class": "bottle", "confidence": 0.8})
+    >>> load_json_bytes(data)
+    {'class': 'bottle', 'confidence': 0.8}
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dump_json_bytes(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON, using orjson when available.
+
+    Non-string dict keys are converted to strings, as json.dumps does.
+
+    Args:
+        obj: Value to encode
+        indent: Indent nested values by two spaces instead of writing
+            compact output
+        newline: Append a newline, e.g. for one NDJSON line
+
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    if indent:
+        data = json.dumps(obj, ensure_ascii=False, indent=2)
+    else:
+        data = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    if newline:
+        data += "\n"
+    return data.encode("utf-8")
+
+
+def load_json_bytes(data: bytes) -> Any:
+    """Decode UTF-8 JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
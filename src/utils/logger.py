@@ -11,11 +11,45 @@ Example:
 
 import logging
 import os
-from datetime import datetime
+from functools import lru_cache
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 from typing import Optional
 
+_FORMATTER = logging.Formatter(
+    "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",
+)
 
+
+@lru_cache(maxsize=None)
+def _init_log_dir(log_dir: str) -> Path:
+    """Create the log directory once per process and return its path."""
+    path = Path(log_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _get_file_handler(log_dir: str) -> logging.Handler:
+    """
+    Get the process-wide file handler for a log directory.
+
+    All loggers share one handler (and one open file), which rolls over to
+    app.log.YYYY-MM-DD at midnight so long-running processes don't keep
+    writing to the previous day's file.
+    """
+    handler = TimedRotatingFileHandler(
+        _init_log_dir(log_dir) / "app.log",
+        when="midnight",
+        encoding="utf-8",
+        delay=True,
+    )
+    handler.setFormatter(_FORMATTER)
+    return handler
+
+
+@lru_cache(maxsize=None)
 def get_logger(
     name: str,
     level: int = logging.INFO,
@@ -25,6 +59,9 @@ def get_logger(
     """
     Get or create a logger with consistent formatting.
 
+    Results are cached per argument combination, so repeated calls (e.g. on
+    every import in worker processes) return the configured logger directly.
+
     Args:
         name: Logger name (typically __name__)
         level: Logging level (default: logging.INFO)
@@ -40,33 +77,21 @@ def get_logger(
     """
     logger = logging.getLogger(name)
 
-    # Avoid adding handlers multiple times
+    # Avoid adding handlers multiple times (the same name may be requested
+    # with different arguments, which bypasses the cache)
     if logger.handlers:
         return logger
 
     logger.setLevel(level)
 
-    # Formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
     # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(level)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(_FORMATTER)
     logger.addHandler(console_handler)
 
-    # File handler
+    # Shared file handler; filtering is left to the logger's own level
     if log_to_file:
-        Path(log_dir).mkdir(parents=True, exist_ok=True)
-        today = datetime.now().strftime("%Y-%m-%d")
-        log_file = Path(log_dir) / f"{today}.log"
-
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(level)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(_get_file_handler(log_dir))
 
     return logger
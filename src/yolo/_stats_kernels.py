@@ -0,0 +1,26 @@
+"""
+Numeric reductions over detection confidences.
+
+The reductions run as vectorized NumPy operations on a 1-D float64 array.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Below this many detections, building the array costs more than it saves
+KERNEL_MIN_SIZE = 64
+
+
+def summarize(conf: np.ndarray, threshold: float) -> Tuple[float, int, int]:
+    """
+    Reduce an array of confidences in one call.
+
+    Args:
+        conf: Confidence scores
+        threshold: Scores strictly above this are counted as high
+
+    Returns:
+        Tuple of (sum of scores, count above threshold, number of scores)
+    """
+    return float(conf.sum()), int(np.count_nonzero(conf > threshold)), conf.shape[0]
@@ -0,0 +1,181 @@
+"""
+Content-addressed cache for YOLO detection results.
+
+Detections are keyed on the SHA-1 of the image bytes plus the model
+settings (model, confidence threshold, image size and precision), so
+re-running the pipeline over the same images skips inference. A file's
+size and mtime are remembered alongside its hash, so unchanged files are
+not re-read just to be hashed.
+
+Example:
+    >>> from src.yolo.cache import DetectionCache
+    >>> cache = DetectionCache("data/cache/detections.sqlite", "yolov8n.pt")
+    >>> sha1 = cache.file_hash("image.jpg")
+    >>> detections = cache.get("image.jpg", 0.25, sha1)
+    >>> if detections is None:
+    ...     detections = detector.detect_objects("image.jpg")
+    ...     cache.put("image.jpg", 0.25, detections, sha1)
+"""
+
+import hashlib
+import os
+import sqlite3
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from src.utils.json_io import dump_json_bytes, load_json_bytes
+from src.utils.logger import get_logger
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    sha1 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS detections (
+    sha1 TEXT NOT NULL,
+    model_name TEXT NOT NULL,
+    confidence_threshold REAL NOT NULL,
+    imgsz INTEGER NOT NULL,
+    precision TEXT NOT NULL,
+    detections BLOB NOT NULL,
+    PRIMARY KEY (sha1, model_name, confidence_threshold, imgsz, precision)
+);
+"""
+
+
+class DetectionCache:
+    """
+    SQLite-backed cache mapping image content to detection results.
+
+    Attributes:
+        db_path (Path): Location of the SQLite database
+        model_name (str): Model the cached detections came from
+        imgsz (int): Inference image size the detections came from
+        precision (str): Inference precision the detections came from
+        logger (Logger): Logger instance
+
+    Example:
+        >>> cache = DetectionCache("detections.sqlite", "yolov8n.pt")
+        >>> cache.put("image.jpg", 0.25, [{"class": "bottle", "confidence": 0.8}])
+        >>> cache.get("image.jpg", 0.25)
+        [{'class': 'bottle', 'confidence': 0.8}]
+    """
+
+    def __init__(
+        self, db_path: str, model_name: str, imgsz: int = 640, precision: str = "fp32"
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            model_name: YOLO model the detections are produced with
+            imgsz: Inference image size the detections are produced with
+            precision: Precision inference runs in ('fp32', 'fp16' or 'int8')
+        """
+        self.db_path = Path(db_path)
+        self.model_name = model_name
+        self.imgsz = imgsz
+        self.precision = precision
+        self.logger = get_logger(__name__)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.executescript(_SCHEMA)
+
+    def get(
+        self, image_path: str, confidence_threshold: float, sha1: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached detections for an image.
+
+        Args:
+            image_path: Path to the image file
+            confidence_threshold: Confidence threshold used for detection
+            sha1: The image's file_hash, if already computed
+
+        Returns:
+            Cached detections, or None on a miss
+        """
+        row = self._conn.execute(
+            "SELECT detections FROM detections WHERE sha1 = ? "
+            "AND model_name = ? AND confidence_threshold = ? AND imgsz = ? "
+            "AND precision = ?",
+            (
+                sha1 or self.file_hash(image_path),
+                self.model_name,
+                confidence_threshold,
+                self.imgsz,
+                self.precision,
+            ),
+        ).fetchone()
+
+        if row is None:
+            return None
+        return load_json_bytes(row[0])
+
+    def put(
+        self,
+        image_path: str,
+        confidence_threshold: float,
+        detections: List[Dict[str, Any]],
+        sha1: Optional[str] = None,
+    ) -> None:
+        """
+        Store detections for an image.
+
+        Args:
+            image_path: Path to the image file
+            confidence_threshold: Confidence threshold used for detection
+            detections: Detection results to cache
+            sha1: The image's file_hash, if already computed
+        """
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO detections VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    sha1 or self.file_hash(image_path),
+                    self.model_name,
+                    confidence_threshold,
+                    self.imgsz,
+                    self.precision,
+                    dump_json_bytes(detections),
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def file_hash(self, image_path: str) -> str:
+        """
+        Return the SHA-1 of a file, reusing the stored hash if unchanged.
+
+        Pass the result to get and put so a miss followed by a store hashes
+        the image only once.
+
+        Args:
+            image_path: Path to the image file
+
+        Returns:
+            Hex digest of the file contents
+        """
+        st = os.stat(image_path)
+        row = self._conn.execute(
+            "SELECT mtime_ns, size, sha1 FROM file_hashes WHERE path = ?",
+            (image_path,),
+        ).fetchone()
+        if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row[2]
+
+        with open(image_path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)",
+                (image_path, st.st_mtime_ns, st.st_size, digest),
+            )
+        return digest
@@ -0,0 +1,231 @@
+"""
+Columnar (struct-of-arrays) storage for the detections of one image.
+
+A DetectionBatch keeps class ids, confidences and boxes in three NumPy
+arrays instead of one dictionary per detection, which is far smaller and
+lets statistics run as single array operations.
+
+Example:
+    >>> from src.yolo.detection_batch import DetectionBatch
+    >>> batch = DetectionBatch.from_dicts(detections)
+    >>> batch.confs.mean()
+    >>> batch.as_dicts()  # back to the list-of-dicts format
+"""
+
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Dict, Any, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+
+@dataclass(frozen=True, eq=False)
+class DetectionBatch:
+    """
+    Detections for one image stored as parallel arrays.
+
+    Attributes:
+        class_ids (np.ndarray): int16[N] class ids
+        confs (np.ndarray): float32[N] confidence scores
+        bboxes (np.ndarray): float32[N, 4] boxes as x1, y1, x2, y2
+        names (List[str]): Class name for each class id
+    """
+
+    class_ids: np.ndarray
+    confs: np.ndarray
+    bboxes: np.ndarray
+    names: List[str]
+
+    @classmethod
+    def from_result(
+        cls, result: Any, names: Optional[List[str]] = None
+    ) -> "DetectionBatch":
+        """
+        Build a batch from one Ultralytics Results object.
+
+        Each tensor is copied to host memory once for the whole image.
+
+        Args:
+            result: Results object for a single image
+            names: Prebuilt names table (e.g. from intern_names) to share
+                across images; built from result.names when omitted
+
+        Returns:
+            DetectionBatch holding the image's boxes
+        """
+        if names is None:
+            names = _names_list(result.names)
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(names)
+
+        return cls(
+            class_ids=boxes.cls.cpu().numpy().astype(np.int16),
+            confs=boxes.conf.cpu().numpy().astype(np.float32),
+            bboxes=boxes.xyxy.cpu().numpy().astype(np.float32).reshape(-1, 4),
+            names=names,
+        )
+
+    @classmethod
+    def from_dicts(cls, detections: List[Dict[str, Any]]) -> "DetectionBatch":
+        """
+        Build a batch from list-of-dicts detections.
+
+        Args:
+            detections: Detection dictionaries with class, confidence and bbox
+
+        Returns:
+            DetectionBatch holding the same detections
+        """
+        names = []
+        ids = {}
+        class_ids = np.empty(len(detections), dtype=np.int16)
+        for i, det in enumerate(detections):
+            class_id = det.get("class_id")
+            if class_id is None:
+                class_id = ids.setdefault(det["class"], len(ids))
+            if class_id >= len(names):
+                names.extend([""] * (class_id + 1 - len(names)))
+            names[class_id] = det["class"]
+            class_ids[i] = class_id
+
+        return cls(
+            class_ids=class_ids,
+            confs=np.fromiter(
+                (det["confidence"] for det in detections),
+                dtype=np.float32,
+                count=len(detections),
+            ),
+            bboxes=np.array(
+                [det["bbox"] for det in detections], dtype=np.float32
+            ).reshape(-1, 4),
+            names=names,
+        )
+
+    @classmethod
+    def empty(cls, names: Sequence[str] = ()) -> "DetectionBatch":
+        """Return a batch with no detections."""
+        return cls(
+            class_ids=np.empty(0, dtype=np.int16),
+            confs=np.empty(0, dtype=np.float32),
+            bboxes=np.empty((0, 4), dtype=np.float32),
+            names=list(names),
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["DetectionBatch"]) -> "DetectionBatch":
+        """
+        Join batches produced by the same model into one.
+
+        Args:
+            batches: Batches sharing one names table
+
+        Returns:
+            DetectionBatch with the detections of all batches in order
+        """
+        if len(batches) == 1:
+            return batches[0]
+        if not batches:
+            return cls.empty()
+        return cls(
+            class_ids=np.concatenate([b.class_ids for b in batches]),
+            confs=np.concatenate([b.confs for b in batches]),
+            bboxes=np.concatenate([b.bboxes for b in batches]),
+            names=batches[0].names,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of detections."""
+        return self.class_ids.shape[0]
+
+    def class_names(self) -> np.ndarray:
+        """Return the class name of every detection."""
+        return np.take(np.asarray(self.names, dtype=object), self.class_ids)
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Convert back to the list-of-dicts detection format.
+
+        Returns:
+            List of detection dictionaries, as returned by detect_objects
+        """
+        names = self.names
+        return [
+            {
+                "class": names[class_id],
+                "class_lower": _lower(names[class_id]),
+                "confidence": conf,
+                "bbox": bbox,
+                "class_id": class_id,
+            }
+            for class_id, conf, bbox in zip(
+                self.class_ids.tolist(), self.confs.tolist(), self.bboxes.tolist()
+            )
+        ]
+
+    def summary(self, high_threshold: float = 0.7) -> Dict[str, Any]:
+        """
+        Summarize the batch with array operations.
+
+        Args:
+            high_threshold: Scores strictly above this count as high confidence
+
+        Returns:
+            Dictionary in the get_detection_summary format
+        """
+        if not len(self):
+            return {
+                "total_objects": 0,
+                "unique_classes": [],
+                "class_counts": {},
+                "avg_confidence": 0.0,
+                "high_confidence": 0,
+            }
+
+        # np.unique sorts; reorder by first occurrence like the dict version
+        ids, first, counts = np.unique(
+            self.class_ids, return_index=True, return_counts=True
+        )
+        order = np.argsort(first)
+        class_counts = {
+            self.names[class_id]: count
+            for class_id, count in zip(ids[order].tolist(), counts[order].tolist())
+        }
+
+        return {
+            "total_objects": len(self),
+            "unique_classes": list(class_counts),
+            "class_counts": class_counts,
+            "avg_confidence": float(self.confs.mean(dtype=np.float64)),
+            "high_confidence": int(np.count_nonzero(self.confs > high_threshold)),
+        }
+
+
+Detections = Union[List[Dict[str, Any]], DetectionBatch]
+
+
+def _names_list(names: Union[Mapping[int, str], Sequence[str]]) -> List[str]:
+    """Turn a YOLO names mapping into a list indexed by class id."""
+    if isinstance(names, Mapping):
+        table = [""] * (max(names, default=-1) + 1)
+        for class_id, name in names.items():
+            table[class_id] = name
+        return table
+    return list(names)
+
+
+def intern_names(names: Union[Mapping[int, str], Sequence[str]]) -> List[str]:
+    """
+    Build a names table whose strings are interned.
+
+    Every detection of a class then shares one string object, so equality
+    and hashing in the classifier can short-circuit on identity.
+    """
+    return [sys.intern(name) for name in _names_list(names)]
+
+
+@lru_cache(maxsize=None)
+def _lower(name: str) -> str:
+    """Return the interned lowercase form of a class name."""
+    return sys.intern(name.lower())
@@ -11,13 +11,310 @@ Example:
 """
 
 import csv
-import json
+import gc
+import os
+import re
+import shutil
+from collections import Counter
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import datetime
 import logging
 
+import numpy as np
+
+from src.utils.json_io import dump_json_bytes, load_json_bytes
 from src.utils.logger import get_logger
+from src.yolo.detection_batch import DetectionBatch, Detections
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Reflink ioctl; exposed as fcntl.FICLONE from Python 3.12 on Linux
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
+
+# Column order of the detections CSV; one row per detection, images without
+# detections have no rows
+CSV_FIELDNAMES = (
+    "image_path",
+    "channel_name",
+    "message_id",
+    "detected_class",
+    "confidence",
+    "bbox_x1",
+    "bbox_y1",
+    "bbox_x2",
+    "bbox_y2",
+    "total_objects",
+    "timestamp",
+)
+
+
+# Detections CSV staged server-side by merge_with_messages; row_num keeps
+# the input order through the join
+_MERGE_CREATE_SQL = """
+    CREATE TEMP TABLE tmp_detections (
+        row_num BIGSERIAL,
+        image_path TEXT,
+        channel_name TEXT,
+        message_id TEXT,
+        detected_class TEXT,
+        confidence DOUBLE PRECISION,
+        bbox_x1 DOUBLE PRECISION,
+        bbox_y1 DOUBLE PRECISION,
+        bbox_x2 DOUBLE PRECISION,
+        bbox_y2 DOUBLE PRECISION,
+        total_objects INTEGER,
+        "timestamp" TEXT
+    ) ON COMMIT DROP
+"""
+_MERGE_COLUMNS = ", ".join(f'"{name}"' for name in CSV_FIELDNAMES)
+_MERGE_COPY_IN_SQL = (
+    f"COPY tmp_detections ({_MERGE_COLUMNS}) FROM STDIN WITH CSV HEADER"
+)
+_MERGE_COPY_OUT_SQL = f"""
+    COPY (
+        SELECT {", ".join(f'd."{name}"' for name in CSV_FIELDNAMES)},
+               m.message_date, m.message_text, m.views
+        FROM tmp_detections d
+        LEFT JOIN raw.telegram_messages m
+            ON m.message_id::text = d.message_id
+            AND m.channel_name = d.channel_name
+        ORDER BY d.row_num
+    ) TO STDOUT WITH CSV HEADER
+"""
+
+
+def _indented_member(key: Any, value: Any, depth: int) -> bytes:
+    """
+    Encode one "key": value member of an indented JSON object.
+
+    The member is indented for an object nested depth levels below the
+    top-level one. Encoding a one-item dict lets non-string keys be
+    converted the same way json.dumps converts them.
+    """
+    # b'{\n  "key": ...\n}' -> b'  "key": ...'; JSON strings never hold a
+    # raw newline, so every newline starts an indented line
+    member = dump_json_bytes({key: value}, indent=True)[2:-2]
+    if depth:
+        pad = b"  " * depth
+        member = pad + member.replace(b"\n", b"\n" + pad)
+    return member
+
+
+@contextmanager
+def _gc_paused():
+    """Suspend cyclic garbage collection while building large batches."""
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+# Captures channel_name and message_id from ".../channel_name/message_id.ext"
+_PATH_RE = re.compile(r"([^/\\]+)[/\\]([^/\\]+)\.[^./\\]+$")
+
+
+@lru_cache(maxsize=100_000)
+def _split_image_path(image_path: str) -> Tuple[str, str]:
+    """
+    Split an image path into its message_id and channel_name.
+
+    Format: data/raw/images/channel_name/message_id.jpg
+    """
+    match = _PATH_RE.search(image_path)
+    if match is not None:
+        return match.group(2), match.group(1)
+
+    # No directory or no extension
+    path = Path(image_path)
+    return path.stem, path.parent.name
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Copy a file without moving its bytes through user space where possible.
+
+    Tries a copy-on-write reflink (btrfs/XFS), then os.sendfile, and falls
+    back to shutil.copyfile, e.g. across filesystems or off Linux.
+
+    Raises:
+        shutil.SameFileError: If src and dst are the same file
+    """
+    # Opening dst for writing would truncate src before anything is copied
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        raise shutil.SameFileError(f"{src!r} and {dst!r} are the same file")
+
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError:
+                pass
+
+        if hasattr(os, "sendfile"):
+            try:
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                # A short copy falls through to shutil.copyfile below
+                if offset >= size:
+                    return
+            except OSError:
+                pass
+
+    shutil.copyfile(src, dst)
+
+
+def _image_records(
+    image_path: str, detections: Detections, category: str, processed_at: datetime
+) -> Iterator[Dict[str, Any]]:
+    """Yield the database records for one image's detections."""
+    # Extract identifiers once per image
+    image_name, channel_name = _split_image_path(image_path)
+    if isinstance(detections, DetectionBatch):
+        detections = detections.as_dicts()
+
+    for detection in detections:
+        bbox = detection["bbox"]
+        yield {
+            "message_id": image_name,
+            "channel_name": channel_name,
+            "image_path": image_path,
+            "detected_class": detection["class"],
+            "confidence": detection["confidence"],
+            "image_category": category,
+            "bbox_x1": float(bbox[0]),
+            "bbox_y1": float(bbox[1]),
+            "bbox_x2": float(bbox[2]),
+            "bbox_y2": float(bbox[3]),
+            "processed_at": processed_at,
+        }
+
+
+class StreamingCSVWriter:
+    """
+    Incremental detections CSV writer.
+
+    Rows are written as each image's detections arrive, through a 1 MiB
+    buffer, so the full result set never has to be held in memory. The file
+    and header are only created once the first image is written. Given a
+    classifier, each image is also categorized as it is written. Use
+    DetectionManager.open_csv_writer to create one.
+
+    Attributes:
+        output_path: Path of the CSV file being written
+        count: Number of rows written so far
+        categories: Category of every image written, when a classifier is set
+
+    Example:
+        >>> with manager.open_csv_writer("detections.csv") as writer:
+        ...     detector.batch_detect(images, on_result=writer.write_image)
+    """
+
+    BUFFER_SIZE = 1 << 20
+
+    def __init__(self, output_path: str, logger, classifier=None):
+        """
+        Initialize StreamingCSVWriter.
+
+        Args:
+            output_path: Path to output CSV file
+            logger: Logger instance used to report the final count
+            classifier: Optional ImageClassifier categorizing each image
+        """
+        self.output_path = output_path
+        self.count = 0
+        self.categories = {}
+        self.logger = logger
+        self._classifier = classifier
+        self._file = None
+        self._writer = None
+        # Every row written by one writer shares one timestamp
+        self._timestamp = datetime.now().isoformat()
+
+    def __enter__(self) -> "StreamingCSVWriter":
+        """Return the writer; the file is opened on the first write."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Flush and close the file."""
+        if self._file is None:
+            self.logger.warning("No detection data to save")
+            return
+
+        self._file.close()
+        self._file = None
+        self._writer = None
+        self.logger.info(f"Saved {self.count} detection records to {self.output_path}")
+
+    def write_image(self, image_path: str, detections: Detections) -> None:
+        """
+        Write the rows for one image.
+
+        Args:
+            image_path: Path of the image the detections belong to
+            detections: Detection dictionaries or a DetectionBatch; an empty
+                one writes no rows
+        """
+        if self._writer is None:
+            self._file = open(
+                self.output_path, "w", newline="", buffering=self.BUFFER_SIZE
+            )
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(CSV_FIELDNAMES)
+
+        if self._classifier is not None:
+            self.categories[image_path] = self._classifier.classify_image(detections)
+
+        if not detections:
+            return
+
+        image_name, channel_name = _split_image_path(image_path)
+
+        if isinstance(detections, DetectionBatch):
+            items = zip(
+                detections.class_names().tolist(),
+                detections.confs.tolist(),
+                detections.bboxes.tolist(),
+            )
+        else:
+            items = ((d["class"], d["confidence"], d["bbox"]) for d in detections)
+
+        # Add row for each detection
+        total_objects = len(detections)
+        writerow = self._writer.writerow
+        for class_name, confidence, bbox in items:
+            writerow(
+                (
+                    image_path,
+                    channel_name,
+                    image_name,
+                    class_name,
+                    confidence,
+                    bbox[0],
+                    bbox[1],
+                    bbox[2],
+                    bbox[3],
+                    total_objects,
+                    self._timestamp,
+                )
+            )
+        self.count += total_objects
 
 
 class DetectionManager:
@@ -58,87 +355,43 @@ class DetectionManager:
             >>> manager.save_results_to_csv(results, "detections.csv")
         """
         try:
-            # Prepare CSV data
-            csv_data = []
-
-            for image_path, detections in batch_results.items():
-                # Extract message_id from image path
-                # Format: data/raw/images/channel_name/message_id.jpg
-                image_name = Path(image_path).stem  # Gets message_id
-                channel_name = Path(image_path).parent.name
-
-                if not detections:
-                    # No detections
-                    csv_data.append(
-                        {
-                            "image_path": image_path,
-                            "channel_name": channel_name,
-                            "message_id": image_name,
-                            "detected_class": None,
-                            "confidence": None,
-                            "total_objects": 0,
-                            "timestamp": datetime.now().isoformat(),
-                        }
-                    )
-                else:
-                    # Add row for each detection
-                    for detection in detections:
-                        csv_data.append(
-                            {
-                                "image_path": image_path,
-                                "channel_name": channel_name,
-                                "message_id": image_name,
-                                "detected_class": detection["class"],
-                                "confidence": detection["confidence"],
-                                "bbox_x1": detection["bbox"][0],
-                                "bbox_y1": detection["bbox"][1],
-                                "bbox_x2": detection["bbox"][2],
-                                "bbox_y2": detection["bbox"][3],
-                                "total_objects": len(detections),
-                                "timestamp": datetime.now().isoformat(),
-                            }
-                        )
-
-            # Write to CSV
-            if csv_data:
-                # Define all possible fieldnames to handle rows with and without detections
-                fieldnames = [
-                    "image_path",
-                    "channel_name",
-                    "message_id",
-                    "detected_class",
-                    "confidence",
-                    "bbox_x1",
-                    "bbox_y1",
-                    "bbox_x2",
-                    "bbox_y2",
-                    "total_objects",
-                    "timestamp",
-                ]
-
-                with open(output_path, "w", newline="") as f:
-                    writer = csv.DictWriter(
-                        f, fieldnames=fieldnames, extrasaction="ignore"
-                    )
-                    writer.writeheader()
-                    writer.writerows(csv_data)
-
-                self.logger.info(
-                    f"Saved {len(csv_data)} detection records to {output_path}"
-                )
-            else:
-                self.logger.warning("No detection data to save")
+            with _gc_paused(), self.open_csv_writer(output_path) as writer:
+                for image_path, detections in batch_results.items():
+                    writer.write_image(image_path, detections)
 
         except Exception as e:
             self.logger.error(f"Failed to save CSV: {e}")
             raise
 
+    def open_csv_writer(self, output_path: str, classifier=None) -> StreamingCSVWriter:
+        """
+        Open a CSV writer that accepts detections image by image.
+
+        Args:
+            output_path: Path to output CSV file
+            classifier: Optional ImageClassifier; each image's category is
+                then collected in the writer's categories
+
+        Returns:
+            StreamingCSVWriter to be used as a context manager
+
+        Example:
+            >>> manager = DetectionManager()
+            >>> with manager.open_csv_writer("detections.csv") as writer:
+            ...     writer.write_image("data/raw/images/ch/1.jpg", detections)
+        """
+        return StreamingCSVWriter(output_path, self.logger, classifier)
+
     def save_results_to_json(
         self, batch_results: Dict[str, List[Dict[str, Any]]], output_path: str
     ) -> None:
         """
         Save detection results to JSON file.
 
+        Results are streamed one image entry at a time, so the whole document
+        is never built in memory. The file matches json.dump(..., indent=2)
+        of the full document.
+
         Args:
             batch_results: Dictionary mapping image paths to detections
             output_path: Path to output JSON file
@@ -148,19 +401,21 @@ class DetectionManager:
             >>> manager.save_results_to_json(results, "detections.json")
         """
         try:
-            output_data = {
-                "metadata": {
-                    "timestamp": datetime.now().isoformat(),
-                    "total_images": len(batch_results),
-                    "total_detections": sum(
-                        len(dets) for dets in batch_results.values()
-                    ),
-                },
-                "results": batch_results,
+            metadata = {
+                "timestamp": datetime.now().isoformat(),
+                "total_images": len(batch_results),
+                "total_detections": sum(len(dets) for dets in batch_results.values()),
             }
 
-            with open(output_path, "w") as f:
-                json.dump(output_data, f, indent=2)
+            with _gc_paused(), open(output_path, "wb", buffering=1 << 20) as f:
+                f.write(b"{\n" + _indented_member("metadata", metadata, 0))
+                f.write(b',\n  "results": {')
+                for idx, (image_path, detections) in enumerate(batch_results.items()):
+                    f.write(b",\n" if idx else b"\n")
+                    if isinstance(detections, DetectionBatch):
+                        detections = detections.as_dicts()
+                    f.write(_indented_member(image_path, detections, 1))
+                f.write(b"\n  }\n}" if batch_results else b"}\n}")
 
             self.logger.info(f"Saved detection results to {output_path}")
 
@@ -185,8 +440,8 @@ class DetectionManager:
             >>> results = manager.load_results_from_json("detections.json")
         """
         try:
-            with open(input_path, "r") as f:
-                data = json.load(f)
+            with open(input_path, "rb") as f:
+                data = load_json_bytes(f.read())
 
             self.logger.info(f"Loaded detection results from {input_path}")
             return data.get("results", {})
@@ -212,49 +467,133 @@ class DetectionManager:
             >>> manager = DetectionManager()
             >>> db_records = manager.prepare_for_database(results, categories)
         """
-        db_records = []
+        with _gc_paused():
+            db_records = list(self.prepare_for_database_iter(batch_results, categories))
+
+        self.logger.info(f"Prepared {len(db_records)} records for database")
+        return db_records
+
+    def prepare_for_database_iter(
+        self, batch_results: Dict[str, List[Dict[str, Any]]], categories: Dict[str, str]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield database records one detection at a time.
+
+        Same records as prepare_for_database, for writers that insert in
+        batches and don't need the whole list in memory.
+
+        Args:
+            batch_results: Dictionary mapping image paths to detections
+            categories: Dictionary mapping image paths to categories
+
+        Yields:
+            Dictionary ready for database insertion
+
+        Example:
+            >>> manager = DetectionManager()
+            >>> for record in manager.prepare_for_database_iter(results, categories):
+            ...     writer.add(record)
+        """
+        # Every record in a batch shares one processing time
+        processed_at = datetime.now()
 
         for image_path, detections in batch_results.items():
-            # Extract identifiers
-            image_name = Path(image_path).stem  # message_id
-            channel_name = Path(image_path).parent.name
-            category = categories.get(image_path, "other")
-
-            # Create record for each detection
-            for detection in detections:
-                record = {
-                    "message_id": image_name,
-                    "channel_name": channel_name,
-                    "image_path": image_path,
-                    "detected_class": detection["class"],
-                    "confidence": detection["confidence"],
-                    "image_category": category,
-                    "bbox": json.dumps(detection["bbox"]),
-                    "processed_at": datetime.now(),
-                }
-                db_records.append(record)
+            if not detections:
+                continue
+            yield from _image_records(
+                image_path,
+                detections,
+                categories.get(image_path, "other"),
+                processed_at,
+            )
+
+    def save_and_prepare(
+        self,
+        batch_results: Dict[str, Detections],
+        classifier,
+        output_path: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Classify, save to CSV and prepare database records in one pass.
+
+        Does the work of classify_batch, save_results_to_csv and
+        prepare_for_database while walking batch_results once. When the
+        detections are still being produced, pass the classifier to
+        open_csv_writer instead and read the writer's categories.
+
+        Args:
+            batch_results: Dictionary mapping image paths to detections
+            classifier: ImageClassifier used to categorize each image
+            output_path: Path to output CSV file
+
+        Returns:
+            List of dictionaries ready for database insertion
+
+        Example:
+            >>> manager = DetectionManager()
+            >>> db_records = manager.save_and_prepare(
+            ...     results, ImageClassifier(), "detections.csv"
+            ... )
+        """
+        processed_at = datetime.now()
+        db_records = []
+
+        try:
+            with _gc_paused(), self.open_csv_writer(output_path, classifier) as writer:
+                for image_path, detections in batch_results.items():
+                    writer.write_image(image_path, detections)
+                    if not detections:
+                        continue
+                    db_records.extend(
+                        _image_records(
+                            image_path,
+                            detections,
+                            writer.categories[image_path],
+                            processed_at,
+                        )
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Failed to save CSV: {e}")
+            raise
 
         self.logger.info(f"Prepared {len(db_records)} records for database")
         return db_records
 
-    def merge_with_messages(self, detections_csv: str, output_csv: str) -> None:
+    def merge_with_messages(
+        self, detections_csv: str, output_csv: str, db_connector=None
+    ) -> None:
         """
         Merge detection results with message data.
 
+        With a database connector, the detections CSV is streamed into a
+        temporary table with COPY, joined to raw.telegram_messages in
+        PostgreSQL, and the result streamed back out with COPY, adding
+        message_date, message_text and views columns. Without one the
+        detections CSV is copied unchanged.
+
         Args:
             detections_csv: Path to detections CSV
             output_csv: Path to output merged CSV
+            db_connector: Connected DatabaseConnector (optional)
 
         Example:
             >>> manager = DetectionManager()
-            >>> manager.merge_with_messages("detections.csv", "merged.csv")
+            >>> manager.merge_with_messages("detections.csv", "merged.csv", db)
         """
         try:
-            # This would typically query the database
-            # For now, we'll just copy the detections CSV
-            import shutil
-
-            shutil.copy(detections_csv, output_csv)
+            if db_connector is None:
+                _fast_copy(detections_csv, output_csv)
+            else:
+                with db_connector.get_connection() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(_MERGE_CREATE_SQL)
+                        with open(detections_csv, "rb") as f:
+                            cursor.copy_expert(_MERGE_COPY_IN_SQL, f)
+                        with open(output_csv, "wb") as f:
+                            cursor.copy_expert(_MERGE_COPY_OUT_SQL, f)
+                    # Ends the transaction, dropping the temp table
+                    conn.commit()
 
             self.logger.info(f"Merged results saved to {output_csv}")
 
@@ -280,25 +619,26 @@ class DetectionManager:
             >>> print(f"Total images: {stats['total_images']}")
         """
         total_images = len(batch_results)
-        images_with_detections = sum(1 for dets in batch_results.values() if dets)
-        total_detections = sum(len(dets) for dets in batch_results.values())
+        images_with_detections = 0
+        total_detections = 0
+        class_counts = Counter()
+        confidence_sum = 0.0
 
-        # Class counts
-        class_counts = {}
+        # Single pass over all detections
         for detections in batch_results.values():
+            if not detections:
+                continue
+            images_with_detections += 1
+            total_detections += len(detections)
+            if isinstance(detections, DetectionBatch):
+                class_counts.update(detections.class_names().tolist())
+                confidence_sum += float(detections.confs.sum(dtype=np.float64))
+                continue
             for det in detections:
-                cls = det["class"]
-                class_counts[cls] = class_counts.get(cls, 0) + 1
-
-        # Average confidence
-        all_confidences = [
-            det["confidence"]
-            for detections in batch_results.values()
-            for det in detections
-        ]
-        avg_confidence = (
-            sum(all_confidences) / len(all_confidences) if all_confidences else 0.0
-        )
+                class_counts[det["class"]] += 1
+                confidence_sum += det["confidence"]
+
+        avg_confidence = confidence_sum / total_detections if total_detections else 0.0
 
         return {
             "total_images": total_images,
@@ -309,6 +649,6 @@ class DetectionManager:
                 total_detections / total_images if total_images > 0 else 0
             ),
             "unique_classes": len(class_counts),
-            "class_counts": class_counts,
+            "class_counts": dict(class_counts),
             "avg_confidence": avg_confidence,
         }
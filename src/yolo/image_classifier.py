@@ -11,10 +11,33 @@ Example:
     >>> print(category)  # 'promotional', 'product_display', etc.
 """
 
-from typing import List, Dict, Any
+import heapq
+import sys
+from collections import Counter
+from operator import itemgetter
+from typing import List, Dict, Any, Set, Tuple
 import logging
 
+import numpy as np
+
 from src.utils.logger import get_logger
+from src.yolo.detection_batch import DetectionBatch, Detections
+
+# Category names, interned so comparisons and dict lookups hit on identity
+PROMOTIONAL = sys.intern("promotional")
+PRODUCT_DISPLAY = sys.intern("product_display")
+LIFESTYLE = sys.intern("lifestyle")
+OTHER = sys.intern("other")
+
+_by_confidence = itemgetter("confidence")
+
+# (has_person, has_product) -> category
+_CATEGORY = {
+    (True, True): PROMOTIONAL,
+    (False, True): PRODUCT_DISPLAY,
+    (True, False): LIFESTYLE,
+    (False, False): OTHER,
+}
 
 
 class ImageClassifier:
@@ -38,20 +61,21 @@ class ImageClassifier:
     """
 
     # YOLO class names relevant to medical/pharmaceutical content
-    PERSON_CLASSES = {"person"}
-    PRODUCT_CLASSES = {"bottle", "cup", "bowl", "vase", "potted plant"}
-    MEDICAL_RELEVANT = {"bottle", "cup", "cell phone", "book"}
+    PERSON_CLASSES = frozenset({"person"})
+    PRODUCT_CLASSES = frozenset({"bottle", "cup", "bowl", "vase", "potted plant"})
+    MEDICAL_RELEVANT = frozenset({"bottle", "cup", "cell phone", "book"})
+    _RELEVANT = PERSON_CLASSES | PRODUCT_CLASSES
 
     def __init__(self):
         """Initialize the image classifier."""
         self.logger = get_logger(__name__)
 
-    def classify_image(self, detections: List[Dict[str, Any]]) -> str:
+    def classify_image(self, detections: Detections) -> str:
         """
         Classify image based on detected objects.
 
         Args:
-            detections: List of detection dictionaries from YOLODetector
+            detections: Detection dictionaries or a DetectionBatch from YOLODetector
 
         Returns:
             Category string: 'promotional', 'product_display', 'lifestyle', or 'other'
@@ -63,26 +87,9 @@ class ImageClassifier:
             >>> print(category)  # 'product_display'
         """
         if not detections:
-            return "other"
-
-        # Get unique detected classes
-        detected_classes = {det["class"].lower() for det in detections}
+            return OTHER
 
-        # Check for person presence
-        has_person = bool(detected_classes & self.PERSON_CLASSES)
-
-        # Check for product presence
-        has_product = bool(detected_classes & self.PRODUCT_CLASSES)
-
-        # Classification logic
-        if has_person and has_product:
-            return "promotional"
-        elif has_product and not has_person:
-            return "product_display"
-        elif has_person and not has_product:
-            return "lifestyle"
-        else:
-            return "other"
+        return self._classify_from_set(self._class_set(detections))
 
     def get_dominant_objects(
         self, detections: List[Dict[str, Any]], top_n: int = 3
@@ -106,12 +113,12 @@ class ImageClassifier:
         if not detections:
             return []
 
-        # Sort by confidence (descending)
-        sorted_detections = sorted(
-            detections, key=lambda x: x["confidence"], reverse=True
-        )
+        if len(detections) <= top_n:
+            # Everything is kept; a plain sort beats the heap setup cost
+            return sorted(detections, key=_by_confidence, reverse=True)
 
-        return sorted_detections[:top_n]
+        # Partial sort: O(N log k) with a bounded heap, stable like sorted()
+        return heapq.nlargest(top_n, detections, key=_by_confidence)
 
     def get_classification_confidence(self, detections: List[Dict[str, Any]]) -> float:
         """
@@ -131,19 +138,7 @@ class ImageClassifier:
         if not detections:
             return 0.0
 
-        # Get confidences of relevant objects (person, product)
-        relevant_classes = self.PERSON_CLASSES | self.PRODUCT_CLASSES
-        relevant_confidences = [
-            det["confidence"]
-            for det in detections
-            if det["class"].lower() in relevant_classes
-        ]
-
-        if not relevant_confidences:
-            # Use average of all detections if no relevant classes found
-            return sum(det["confidence"] for det in detections) / len(detections)
-
-        return sum(relevant_confidences) / len(relevant_confidences)
+        return self._scan_detections(detections)[3]
 
     def get_detailed_classification(
         self, detections: List[Dict[str, Any]]
@@ -169,13 +164,10 @@ class ImageClassifier:
             >>> print(f"Category: {details['category']}")
             >>> print(f"Confidence: {details['confidence']:.2f}")
         """
-        category = self.classify_image(detections)
-        confidence = self.get_classification_confidence(detections)
-        dominant = self.get_dominant_objects(detections, top_n=3)
-
-        detected_classes = {det["class"].lower() for det in detections}
-        has_person = bool(detected_classes & self.PERSON_CLASSES)
-        has_product = bool(detected_classes & self.PRODUCT_CLASSES)
+        detected_classes, has_person, has_product, confidence, dominant = (
+            self._scan_detections(detections, top_n=3)
+        )
+        category = self._category(has_person, has_product)
 
         return {
             "category": category,
@@ -190,6 +182,86 @@ class ImageClassifier:
             "unique_classes": list(detected_classes),
         }
 
+    def _scan_detections(
+        self, detections: List[Dict[str, Any]], top_n: int = 0
+    ) -> Tuple[Set[str], bool, bool, float, List[Dict[str, Any]]]:
+        """
+        Collect everything the classification helpers need in one pass.
+
+        Args:
+            detections: List of detection dictionaries
+            top_n: Number of most confident detections to keep (0 skips it)
+
+        Returns:
+            Tuple of (detected_classes, has_person, has_product,
+            classification confidence, top_n detections by confidence)
+        """
+        if isinstance(detections, DetectionBatch):
+            detections = detections.as_dicts()
+
+        relevant_classes = self._RELEVANT
+        detected_classes = set()
+        has_person = has_product = False
+        total_sum = relevant_sum = 0.0
+        relevant_count = 0
+        # Min-heap of (confidence, -index, detection); the negated index keeps
+        # earlier detections first among equal confidences, like a stable sort
+        top = []
+
+        for index, det in enumerate(detections):
+            # Detections from older runs may predate the class_lower field
+            cls = det.get("class_lower") or det["class"].lower()
+            conf = det["confidence"]
+            detected_classes.add(cls)
+            total_sum += conf
+
+            if cls in relevant_classes:
+                relevant_sum += conf
+                relevant_count += 1
+                if cls in self.PERSON_CLASSES:
+                    has_person = True
+                if cls in self.PRODUCT_CLASSES:
+                    has_product = True
+
+            if top_n > 0:
+                entry = (conf, -index, det)
+                if len(top) < top_n:
+                    heapq.heappush(top, entry)
+                elif entry > top[0]:
+                    heapq.heapreplace(top, entry)
+
+        if relevant_count:
+            confidence = relevant_sum / relevant_count
+        elif detections:
+            # Use average of all detections if no relevant classes found
+            confidence = total_sum / len(detections)
+        else:
+            confidence = 0.0
+
+        dominant = [entry[2] for entry in sorted(top, reverse=True)]
+        return detected_classes, has_person, has_product, confidence, dominant
+
+    @staticmethod
+    def _class_set(detections: Detections) -> Set[str]:
+        """Collect the lowercased class names of a detection list or batch."""
+        if isinstance(detections, DetectionBatch):
+            names = detections.names
+            return {names[i].lower() for i in np.unique(detections.class_ids).tolist()}
+        # Detections from older runs may predate the class_lower field
+        return {det.get("class_lower") or det["class"].lower() for det in detections}
+
+    def _classify_from_set(self, detected_classes: Set[str]) -> str:
+        """Classify an image from its set of lowercased class names."""
+        return self._category(
+            not self.PERSON_CLASSES.isdisjoint(detected_classes),
+            not self.PRODUCT_CLASSES.isdisjoint(detected_classes),
+        )
+
+    @staticmethod
+    def _category(has_person: bool, has_product: bool) -> str:
+        """Map person/product presence to a category name."""
+        return _CATEGORY[has_person, has_product]
+
     def classify_batch(
         self, batch_detections: Dict[str, List[Dict[str, Any]]]
     ) -> Dict[str, str]:
@@ -212,11 +284,9 @@ class ImageClassifier:
             >>> for img, cat in categories.items():
             ...     print(f"{img}: {cat}")
         """
-        results = {}
-
-        for image_path, detections in batch_detections.items():
-            category = self.classify_image(detections)
-            results[image_path] = category
+        results = dict(
+            zip(batch_detections, map(self.classify_image, batch_detections.values()))
+        )
 
         self.logger.info(f"Classified {len(results)} images")
         return results
@@ -238,19 +308,39 @@ class ImageClassifier:
             >>> stats = classifier.get_category_statistics(batch_detections)
             >>> print(stats['promotional'])  # {'count': 5, 'percentage': 33.3}
         """
-        categories = self.classify_batch(batch_detections)
+        # Classify and count in one traversal, without an intermediate mapping
+        category_counts = Counter(map(self.classify_image, batch_detections.values()))
+        return _category_statistics(category_counts, len(batch_detections))
+
+    def get_statistics_from_categories(
+        self, categories: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Get category statistics from images that are already classified.
+
+        Args:
+            categories: Dictionary mapping image paths to categories, e.g. a
+                CSV writer's categories
+
+        Returns:
+            Dictionary with category counts and percentages, as returned by
+            get_category_statistics
+
+        Example:
+            >>> classifier = ImageClassifier()
+            >>> stats = classifier.get_statistics_from_categories(categories)
+        """
+        return _category_statistics(Counter(categories.values()), len(categories))
 
-        category_counts = {}
-        for category in categories.values():
-            category_counts[category] = category_counts.get(category, 0) + 1
 
-        total = len(categories)
-        statistics = {}
+def _category_statistics(category_counts: Counter, total: int) -> Dict[str, Any]:
+    """Turn per-category image counts into counts and percentages."""
+    statistics = {}
 
-        for category, count in category_counts.items():
-            statistics[category] = {
-                "count": count,
-                "percentage": (count / total * 100) if total > 0 else 0,
-            }
+    for category, count in category_counts.items():
+        statistics[category] = {
+            "count": count,
+            "percentage": (count / total * 100) if total > 0 else 0,
+        }
 
-        return statistics
+    return statistics
@@ -12,13 +12,18 @@ Example:
 """
 
 import os
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any, Set
 import logging
 
 try:
     from ultralytics import YOLO
     import cv2
+    import numpy as np
+    import torch
     from PIL import Image
 except ImportError as e:
     raise ImportError(
@@ -27,6 +32,44 @@ except ImportError as e:
     )
 
 from src.utils.logger import get_logger
+from src.yolo.cache import DetectionCache
+from src.yolo.detection_batch import DetectionBatch, Detections, intern_names
+from src.yolo._stats_kernels import KERNEL_MIN_SIZE, summarize
+
+PRECISIONS = ("fp32", "fp16", "int8")
+
+_confidence = itemgetter("confidence")
+
+
+@lru_cache(maxsize=4)
+def _load_model(model_name: str, device: Optional[str] = None) -> "YOLO":
+    """
+    Load a YOLO model once per process and share it between detectors.
+
+    Detectors built with the same weights and device reuse one model object,
+    so they should not run inference on it from several threads at once.
+    The device move and layer fusion happen here, so callers never modify
+    the shared object.
+
+    Args:
+        model_name: Weights or engine file to load
+        device: Device to move the model to and fuse it on; None keeps the
+            model as loaded
+    """
+    model = YOLO(model_name)
+    if device is not None:
+        model.to(device)
+        model.fuse()
+    return model
+
+
+def effective_precision(precision: str) -> str:
+    """
+    Return the precision inference really runs in for a requested one.
+
+    Reduced precision needs a CUDA device; on CPU every model runs fp32.
+    """
+    return precision if torch.cuda.is_available() else "fp32"
 
 
 class YOLODetector:
@@ -36,6 +79,12 @@ class YOLODetector:
     Attributes:
         model_name (str): Name of the YOLO model to use
         confidence_threshold (float): Minimum confidence for detections
+        batch_size (int): Number of images per model call in batch_detect
+        imgsz (int): Inference image size
+        precision (str): Requested inference precision
+        effective_precision (str): Precision inference actually runs in
+        half (bool): Whether inference runs in fp16
+        cache (DetectionCache): Optional cache of earlier detections
         model (YOLO): Loaded YOLO model
         logger (Logger): Logger instance
 
@@ -47,7 +96,14 @@ class YOLODetector:
     """
 
     def __init__(
-        self, model_name: str = "yolov8n.pt", confidence_threshold: float = 0.25
+        self,
+        model_name: str = "yolov8n.pt",
+        confidence_threshold: float = 0.25,
+        batch_size: int = 16,
+        precision: str = "fp16",
+        calibration_data: Optional[str] = None,
+        cache: Optional[DetectionCache] = None,
+        imgsz: int = 640,
     ):
         """
         Initialize the YOLO detector.
@@ -55,33 +111,106 @@ class YOLODetector:
         Args:
             model_name: YOLO model to use (yolov8n, yolov8s, yolov8m, yolov8l, yolov8x)
             confidence_threshold: Minimum confidence score (0.0-1.0)
+            batch_size: Number of images per model call in batch_detect
+            precision: Inference precision ('fp32', 'fp16' or 'int8'); reduced
+                precision only applies on a CUDA device, CPUs run fp32
+            calibration_data: Dataset YAML used to calibrate the int8 engine
+            cache: Optional detection cache consulted before running the model;
+                its model name, image size and precision must match this
+                detector's
+            imgsz: Inference image size
+
+        Raises:
+            ValueError: If precision is not one of PRECISIONS, or the cache
+                was opened for other model settings
         """
+        if precision not in PRECISIONS:
+            raise ValueError(
+                f"Unsupported precision '{precision}', expected one of {PRECISIONS}"
+            )
+
         self.model_name = model_name
         self.confidence_threshold = confidence_threshold
+        self.batch_size = batch_size
+        self.imgsz = imgsz
+        self.precision = precision
+        self.cache = cache
+        self._names_source = None
+        self._interned_names = []
         self.logger = get_logger(__name__)
 
+        # Ultralytics ignores half=True on CPU, so only enable it on CUDA
+        on_gpu = torch.cuda.is_available()
+        self.half = on_gpu and precision == "fp16"
+        # The int8 engine is exported from the unmodified weights
+        device = "cuda" if on_gpu and precision != "int8" else None
+
         # Load YOLO model
         try:
             self.logger.info(f"Loading YOLO model: {model_name}")
-            self.model = YOLO(model_name)
+            self.model = _load_model(model_name, device)
             self.logger.info("YOLO model loaded successfully")
         except Exception as e:
             self.logger.error(f"Failed to load YOLO model: {e}")
             raise
 
+        if on_gpu and precision == "int8":
+            # Build a TensorRT engine once and serve from it
+            self.logger.info("Exporting int8 TensorRT engine")
+            engine_path = self.model.export(
+                format="engine", int8=True, data=calibration_data
+            )
+            self.model = _load_model(engine_path)
+        elif not on_gpu and precision != "fp32":
+            self.logger.info(f"No CUDA device, running {precision} model in fp32")
+
+        self.effective_precision = effective_precision(precision)
+
+        if cache is not None:
+            expected = (model_name, imgsz, self.effective_precision)
+            actual = (cache.model_name, cache.imgsz, cache.precision)
+            if actual != expected:
+                raise ValueError(
+                    f"Detection cache holds results for (model, imgsz, precision) "
+                    f"{actual}, but this detector runs {expected}"
+                )
+
+    def warmup(self, imgsz: Optional[int] = None) -> None:
+        """
+        Run one blank image through the model to pay setup costs up front.
+
+        Args:
+            imgsz: Side length of the square dummy image; defaults to the
+                detector's inference size
+
+        Example:
+            >>> detector = YOLODetector()
+            >>> detector.warmup()
+        """
+        imgsz = imgsz or self.imgsz
+        dummy = np.zeros((imgsz, imgsz, 3), np.uint8)
+        self.model(dummy, imgsz=imgsz, verbose=False, half=self.half)
+        self.logger.debug(f"Warmed up model at {imgsz}x{imgsz}")
+
     def detect_objects(
-        self, image_path: str, confidence_threshold: Optional[float] = None
-    ) -> List[Dict[str, Any]]:
+        self,
+        image_path: str,
+        confidence_threshold: Optional[float] = None,
+        as_batch: bool = False,
+    ) -> Detections:
         """
         Detect objects in a single image.
 
         Args:
             image_path: Path to the image file
             confidence_threshold: Override default confidence threshold
+            as_batch: Return a columnar DetectionBatch instead of dicts
 
         Returns:
-            List of detections, each containing:
+            DetectionBatch if as_batch, otherwise a list of detections,
+            each containing:
                 - class: Object class name
+                - class_lower: Lowercased class name, for classification
                 - confidence: Confidence score (0-1)
                 - bbox: Bounding box [x1, y1, x2, y2]
                 - class_id: Numeric class ID
@@ -100,32 +229,69 @@ class YOLODetector:
 
         conf_threshold = confidence_threshold or self.confidence_threshold
 
+        sha1 = None
+        if self.cache is not None:
+            sha1 = self.cache.file_hash(image_path)
+            cached = self.cache.get(image_path, conf_threshold, sha1)
+            if cached is not None:
+                return DetectionBatch.from_dicts(cached) if as_batch else cached
+
+        return self._detect_objects_unchecked(
+            image_path, conf_threshold, as_batch, sha1
+        )
+
+    def _detect_objects_unchecked(
+        self,
+        image_path: str,
+        conf_threshold: float,
+        as_batch: bool = False,
+        sha1: Optional[str] = None,
+    ) -> Detections:
+        """
+        Run the model on an image already known to exist.
+
+        Args:
+            image_path: Path to the image file
+            conf_threshold: Confidence threshold to apply
+            as_batch: Return a columnar DetectionBatch instead of dicts
+            sha1: The image's cache file_hash, if already computed
+
+        Returns:
+            DetectionBatch or list of detection dictionaries
+        """
         try:
             # Run detection
-            results = self.model(image_path, conf=conf_threshold, verbose=False)
+            results = self.model(
+                image_path,
+                conf=conf_threshold,
+                imgsz=self.imgsz,
+                verbose=False,
+                half=self.half,
+            )
 
             # Parse results
-            detections = []
-            for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    detection = {
-                        "class": result.names[int(box.cls)],
-                        "confidence": float(box.conf),
-                        "bbox": box.xyxy[0].tolist(),
-                        "class_id": int(box.cls),
-                    }
-                    detections.append(detection)
-
-            self.logger.debug(f"Detected {len(detections)} objects in {image_path}")
-            return detections
+            batch = DetectionBatch.concat(
+                [
+                    DetectionBatch.from_result(result, self._names_table(result))
+                    for result in results
+                ]
+            )
+
+            if self.cache is not None:
+                self.cache.put(image_path, conf_threshold, batch.as_dicts(), sha1)
+
+            self.logger.debug(f"Detected {len(batch)} objects in {image_path}")
+            return batch if as_batch else batch.as_dicts()
 
         except Exception as e:
             self.logger.error(f"Detection failed for {image_path}: {e}")
             raise
 
     def batch_detect(
-        self, image_paths: List[str], confidence_threshold: Optional[float] = None
+        self,
+        image_paths: List[str],
+        confidence_threshold: Optional[float] = None,
+        on_result: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """
         Detect objects in multiple images.
@@ -133,6 +299,8 @@ class YOLODetector:
         Args:
             image_paths: List of image file paths
             confidence_threshold: Override default confidence threshold
+            on_result: Optional callback invoked with (image_path, detections)
+                as soon as each image is done, e.g. a CSV writer's write_image
 
         Returns:
             Dictionary mapping image paths to their detection results
@@ -144,32 +312,144 @@ class YOLODetector:
             >>> for img, detections in results.items():
             ...     print(f"{img}: {len(detections)} objects")
         """
-        results = {}
+        # Pre-fill so the output keeps the input order
+        results = {image_path: [] for image_path in image_paths}
         total = len(image_paths)
+        conf_threshold = confidence_threshold or self.confidence_threshold
 
         self.logger.info(f"Processing batch of {total} images")
 
-        for idx, image_path in enumerate(image_paths, 1):
-            try:
-                detections = self.detect_objects(image_path, confidence_threshold)
-                results[image_path] = detections
+        def finish(image_path: str, detections: List[Dict[str, Any]]) -> None:
+            results[image_path] = detections
+            if on_result is not None:
+                on_result(image_path, detections)
+
+        # Missing files would fail a whole model call, so drop them up front;
+        # cached images skip the model entirely
+        existing = self._existing_paths(image_paths)
+        pending = []
+        # Each image is hashed once for both the lookup and the store
+        hashes = {}
+        for image_path in image_paths:
+            if image_path not in existing:
+                self.logger.warning(f"Skipping {image_path}: image not found")
+                finish(image_path, [])
+                continue
+            if self.cache is not None:
+                sha1 = hashes[image_path] = self.cache.file_hash(image_path)
+                cached = self.cache.get(image_path, conf_threshold, sha1)
+                if cached is not None:
+                    finish(image_path, cached)
+                    continue
+            pending.append(image_path)
+
+        if len(pending) < total:
+            self.logger.info(f"{total - len(pending)} images cached or missing")
+
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start : start + self.batch_size]
 
-                if idx % 10 == 0:
-                    self.logger.info(f"Processed {idx}/{total} images")
+            try:
+                # stream=True yields one Results object per image lazily
+                chunk_results = self.model(
+                    chunk,
+                    conf=conf_threshold,
+                    imgsz=self.imgsz,
+                    verbose=False,
+                    stream=True,
+                    half=self.half,
+                )
+                chunk_detections = [self._parse_result(r) for r in chunk_results]
+                if self.cache is not None:
+                    for image_path, detections in zip(chunk, chunk_detections):
+                        self.cache.put(
+                            image_path,
+                            conf_threshold,
+                            detections,
+                            hashes[image_path],
+                        )
 
             except Exception as e:
-                self.logger.warning(f"Skipping {image_path}: {e}")
-                results[image_path] = []
+                # Fall back to one call per image so a single bad file
+                # does not drop the rest of the chunk
+                self.logger.warning(f"Batch call failed ({e}), retrying per image")
+                chunk_detections = []
+                for image_path in chunk:
+                    try:
+                        detections = self._detect_objects_unchecked(
+                            image_path,
+                            conf_threshold,
+                            sha1=hashes.get(image_path),
+                        )
+                    except Exception as err:
+                        self.logger.warning(f"Skipping {image_path}: {err}")
+                        detections = []
+                    chunk_detections.append(detections)
+
+            for image_path, detections in zip(chunk, chunk_detections):
+                finish(image_path, detections)
+
+            done = min(start + self.batch_size, len(pending))
+            self.logger.info(f"Processed {done}/{len(pending)} images")
 
         self.logger.info(f"Batch processing complete: {len(results)} images")
         return results
 
-    def get_detection_summary(self, detections: List[Dict[str, Any]]) -> Dict[str, Any]:
+    @staticmethod
+    def _existing_paths(image_paths: List[str]) -> Set[str]:
+        """
+        Find which image paths exist with one directory listing per folder.
+
+        Args:
+            image_paths: List of image file paths
+
+        Returns:
+            Set of the given paths that exist as files
+        """
+        by_dir = {}
+        for image_path in image_paths:
+            by_dir.setdefault(os.path.dirname(image_path), []).append(image_path)
+
+        existing = set()
+        for directory, paths in by_dir.items():
+            try:
+                with os.scandir(directory or ".") as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            existing.update(p for p in paths if os.path.basename(p) in names)
+        return existing
+
+    def _parse_result(self, result: Any) -> List[Dict[str, Any]]:
+        """
+        Convert one Ultralytics Results object into detection dictionaries.
+
+        Args:
+            result: Results object for a single image
+
+        Returns:
+            List of detection dictionaries
+        """
+        return DetectionBatch.from_result(result, self._names_table(result)).as_dicts()
+
+    def _names_table(self, result: Any) -> List[str]:
+        """
+        Return the interned class names for a result's model.
+
+        The table is rebuilt only when the model's names mapping changes,
+        so all detections share one string object per class.
+        """
+        if result.names is not self._names_source:
+            self._interned_names = intern_names(result.names)
+            self._names_source = result.names
+        return self._interned_names
+
+    def get_detection_summary(self, detections: Detections) -> Dict[str, Any]:
         """
         Get summary statistics for detection results.
 
         Args:
-            detections: List of detection dictionaries
+            detections: List of detection dictionaries, or a DetectionBatch
 
         Returns:
             Dictionary containing:
@@ -185,6 +465,9 @@ class YOLODetector:
             >>> summary = detector.get_detection_summary(detections)
             >>> print(summary['unique_classes'])
         """
+        if isinstance(detections, DetectionBatch):
+            return detections.summary(high_threshold=0.7)
+
         if not detections:
             return {
                 "total_objects": 0,
@@ -194,21 +477,34 @@ class YOLODetector:
                 "high_confidence": 0,
             }
 
-        # Count classes
-        class_counts = {}
-        confidences = []
-
-        for det in detections:
-            class_name = det["class"]
-            class_counts[class_name] = class_counts.get(class_name, 0) + 1
-            confidences.append(det["confidence"])
+        if len(detections) >= KERNEL_MIN_SIZE:
+            # Large lists: reduce confidences as an array, count classes in C
+            class_counts = Counter(det["class"] for det in detections)
+            confidences = np.fromiter(
+                map(_confidence, detections),
+                dtype=np.float64,
+                count=len(detections),
+            )
+            confidence_sum, high_confidence, _ = summarize(confidences, 0.7)
+        else:
+            # Count classes and confidences in one pass
+            class_counts = Counter()
+            confidence_sum = 0.0
+            high_confidence = 0
+
+            for det in detections:
+                class_counts[det["class"]] += 1
+                conf = det["confidence"]
+                confidence_sum += conf
+                if conf > 0.7:
+                    high_confidence += 1
 
         return {
             "total_objects": len(detections),
-            "unique_classes": list(class_counts.keys()),
-            "class_counts": class_counts,
-            "avg_confidence": sum(confidences) / len(confidences),
-            "high_confidence": sum(1 for c in confidences if c > 0.7),
+            "unique_classes": list(class_counts),
+            "class_counts": dict(class_counts),
+            "avg_confidence": confidence_sum / len(detections),
+            "high_confidence": high_confidence,
         }
 
     def detect_and_save(
@@ -236,7 +532,13 @@ class YOLODetector:
 
         try:
             # Run detection with save
-            results = self.model(image_path, conf=conf_threshold, verbose=False)
+            results = self.model(
+                image_path,
+                conf=conf_threshold,
+                imgsz=self.imgsz,
+                verbose=False,
+                half=self.half,
+            )
 
             # Save annotated image
             annotated = results[0].plot()
@@ -245,15 +547,7 @@ class YOLODetector:
             # Parse detections
             detections = []
             for result in results:
-                boxes = result.boxes
-                for box in boxes:
-                    detection = {
-                        "class": result.names[int(box.cls)],
-                        "confidence": float(box.conf),
-                        "bbox": box.xyxy[0].tolist(),
-                        "class_id": int(box.cls),
-                    }
-                    detections.append(detection)
+                detections.extend(self._parse_result(result))
 
             self.logger.info(f"Saved annotated image to {output_path}")
             return detections
@@ -0,0 +1,108 @@
+"""
+Lightweight stand-ins for psycopg2 pool, connection and cursor objects.
+
+Plain classes with call counters instead of nested MagicMocks, for tests
+that only need to see what SQL ran and how often the connection committed.
+
+Example:
+    >>> pool = FakePool(FakeConn(FakeCursor(fetchall_result=[{"id": 1}])))
+    >>> with patch("src.database.db_connector.pool.ThreadedConnectionPool",
+    ...            return_value=pool):
+    ...     db.connect()
+    >>> db.execute_query("SELECT 1")
+    >>> pool.conn.cursor_obj.execute_calls
+    1
+"""
+
+import threading
+
+from psycopg2.pool import PoolError
+
+
+class FakeCursor:
+    """Cursor recording executed statements and returning canned rows."""
+
+    def __init__(self, fetchall_result=None):
+        self.fetchall_result = fetchall_result if fetchall_result is not None else []
+        self.statements = []
+
+    @property
+    def execute_calls(self) -> int:
+        """Number of statements executed."""
+        return len(self.statements)
+
+    def __enter__(self) -> "FakeCursor":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        return False
+
+    def execute(self, query, params=None) -> None:
+        self.statements.append((query, params))
+
+    def fetchall(self):
+        return self.fetchall_result
+
+
+class FakeConn:
+    """Connection handing out a single FakeCursor and counting commits."""
+
+    closed = 0
+    cursor_factory = None
+
+    def __init__(self, cursor=None):
+        self.cursor_obj = cursor or FakeCursor()
+        self.commit_calls = 0
+        self.rollback_calls = 0
+        self.close_calls = 0
+        # Cursor factory in effect for each cursor() call
+        self.cursor_factories = []
+
+    def cursor(self, cursor_factory=None) -> FakeCursor:
+        self.cursor_factories.append(cursor_factory or self.cursor_factory)
+        return self.cursor_obj
+
+    def commit(self) -> None:
+        self.commit_calls += 1
+
+    def rollback(self) -> None:
+        self.rollback_calls += 1
+
+    def close(self) -> None:
+        self.close_calls += 1
+
+
+class FakePool:
+    """
+    Connection pool that always returns the same FakeConn.
+
+    With maxconn set it tracks checked-out connections like
+    ThreadedConnectionPool and raises PoolError once maxconn are in use.
+    """
+
+    def __init__(self, conn=None, maxconn=None):
+        self.conn = conn or FakeConn()
+        self.maxconn = maxconn
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.getconn_calls = 0
+        self.putconn_calls = 0
+        self.closeall_calls = 0
+        self._lock = threading.Lock()
+
+    def getconn(self) -> FakeConn:
+        with self._lock:
+            if self.maxconn is not None and self.in_use >= self.maxconn:
+                raise PoolError("connection pool exhausted")
+            self.getconn_calls += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+        return self.conn
+
+    def putconn(self, conn, close=False) -> None:
+        with self._lock:
+            self.putconn_calls += 1
+            self.in_use -= 1
+
+    def closeall(self) -> None:
+        self.closeall_calls += 1
@@ -3,6 +3,53 @@
 import sys
 from pathlib import Path
 
+import pytest
+import pytest_asyncio
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """
+    Session-wide async API client over an in-process ASGI transport.
+
+    The app's startup/shutdown events run once for the whole session, and
+    every test shares one event loop, so independent requests can be issued
+    concurrently with asyncio.gather.
+    """
+    import httpx
+
+    from api.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+
+
+@pytest.fixture
+def override_db():
+    """
+    Factory fixture replacing the API's database dependency with a mock.
+
+    Call it with the value db.execute() should return, or a side_effect
+    list for endpoints that run several queries. The override is removed
+    on teardown.
+    """
+    from unittest.mock import Mock
+
+    from api.database import get_db
+    from api.main import app
+
+    def _factory(rows=None, side_effect=None):
+        mock_db = Mock()
+        mock_db.execute.return_value = rows
+        mock_db.execute.side_effect = side_effect
+        app.dependency_overrides[get_db] = lambda: mock_db
+        return mock_db
+
+    yield _factory
+    app.dependency_overrides.pop(get_db, None)
@@ -1,11 +1,23 @@
 """Tests for DataLakeManager class."""
 
 import json
+import uuid
 import pytest
 from pathlib import Path
 from src.scraper.data_lake_manager import DataLakeManager
 
 
+@pytest.fixture(scope="session")
+def shared_data_lake(tmp_path_factory):
+    """Data lake shared by tests that only add their own partitions."""
+    return DataLakeManager(base_path=str(tmp_path_factory.mktemp("dl")))
+
+
+def unique_channel() -> str:
+    """Return a channel name no other test writes to."""
+    return f"chan_{uuid.uuid4().hex}"
+
+
 class TestDataLakeManager:
     """Test suite for DataLakeManager."""
 
@@ -20,79 +32,148 @@ class TestDataLakeManager:
         assert (tmp_path / "raw" / "images").exists()
         assert (tmp_path / "processed").exists()
 
-    def test_get_messages_partition_dir(self, temp_data_lake):
+    def test_get_messages_partition_dir(self, shared_data_lake):
         """Test partition directory creation."""
-        partition_dir = temp_data_lake.get_messages_partition_dir("2026-01-18")
+        partition_dir = shared_data_lake.get_messages_partition_dir("2026-01-18")
         assert partition_dir.exists()
         assert partition_dir.name == "2026-01-18"
 
-    def test_get_images_dir(self, temp_data_lake):
+    def test_get_images_dir(self, shared_data_lake):
         """Test images directory creation."""
-        images_dir = temp_data_lake.get_images_dir("test_channel")
+        channel = unique_channel()
+        images_dir = shared_data_lake.get_images_dir(channel)
         assert images_dir.exists()
-        assert images_dir.name == "test_channel"
+        assert images_dir.name == channel
 
-    def test_save_message_json_success(self, temp_data_lake):
+    def test_save_message_json_success(self, shared_data_lake):
         """Test saving messages to JSON file."""
         messages = [
             {"id": 1, "text": "Hello", "date": "2026-01-18"},
             {"id": 2, "text": "World", "date": "2026-01-18"},
         ]
+        channel = unique_channel()
 
-        file_path = temp_data_lake.save_message_json(
-            messages, "test_channel", "2026-01-18"
-        )
+        file_path = shared_data_lake.save_message_json(messages, channel, "2026-01-18")
 
         assert file_path.exists()
-        assert file_path.name == "test_channel.json"
+        assert file_path.name == f"{channel}.json"
 
         # Verify content
-        with open(file_path, "r") as f:
-            saved_data = json.load(f)
+        saved_data = json.loads(file_path.read_bytes())
         assert len(saved_data) == 2
         assert saved_data[0]["id"] == 1
 
-    def test_save_message_json_empty_raises_error(self, temp_data_lake):
+    def test_save_message_json_preserves_unicode(self, shared_data_lake):
+        """Test non-ASCII message text is written as UTF-8, not escaped."""
+        messages = [{"id": 1, "text": "ፓራሲታሞል"}]
+
+        file_path = shared_data_lake.save_message_json(
+            messages, unique_channel(), "2026-01-18"
+        )
+
+        raw = file_path.read_bytes()
+        assert "ፓራሲታሞል".encode("utf-8") in raw
+        assert json.loads(raw)[0]["text"] == "ፓራሲታሞል"
+
+    def test_save_message_json_empty_raises_error(self, shared_data_lake):
         """Test saving empty messages list raises ValueError."""
         with pytest.raises(ValueError, match="Messages list cannot be empty"):
-            temp_data_lake.save_message_json([], "test_channel")
+            shared_data_lake.save_message_json([], "test_channel")
+
+    def test_open_message_writer_streams_ndjson(self, shared_data_lake):
+        """Test streamed messages are written as one JSON object per line."""
+        channel = unique_channel()
+        with shared_data_lake.open_message_writer(channel, "2026-01-18") as w:
+            w.write({"id": 1, "text": "Hello"})
+            w.write({"id": 2, "text": "World"})
+
+        assert w.count == 2
+        assert w.file_path.name == f"{channel}.jsonl"
+        lines = w.file_path.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2]
+
+    def test_open_message_writer_rerun_overwrites(self, shared_data_lake):
+        """Test re-streaming a channel and date replaces the earlier file."""
+        channel = unique_channel()
+        with shared_data_lake.open_message_writer(channel, "2026-01-18") as w:
+            w.write({"id": 1})
+        with shared_data_lake.open_message_writer(channel, "2026-01-18") as w:
+            w.write({"id": 1})
+
+        assert len(w.file_path.read_bytes().splitlines()) == 1
+
+        with pytest.raises(RuntimeError):
+            with shared_data_lake.open_message_writer(channel, "2026-01-18") as w:
+                w.write({"id": 2})
+                raise RuntimeError("scrape failed")
+
+        assert w.file_path.read_bytes().splitlines() == [b'{"id":1}']
+        assert not list(w.file_path.parent.glob("*.tmp"))
+
+    def test_save_message_parquet_success(self, shared_data_lake):
+        """Test saving columnar messages to a Parquet file."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        columns = {"message_id": [1, 2], "message_text": ["Hello", "World"]}
+        channel = unique_channel()
+
+        file_path = shared_data_lake.save_message_parquet(
+            columns, channel, "2026-01-18"
+        )
+
+        assert file_path.name == f"{channel}.parquet"
+        assert pq.read_table(file_path).to_pydict() == columns
+
+    def test_save_message_parquet_empty_raises_error(self, shared_data_lake):
+        """Test saving empty columns raises ValueError."""
+        with pytest.raises(ValueError, match="Messages list cannot be empty"):
+            shared_data_lake.save_message_parquet({"message_id": []}, "test_channel")
 
-    def test_save_image_success(self, temp_data_lake):
+    def test_save_image_success(self, shared_data_lake):
         """Test saving image file."""
         image_data = b"fake_image_data"
 
-        file_path = temp_data_lake.save_image(image_data, "test_channel", 12345)
+        file_path = shared_data_lake.save_image(image_data, unique_channel(), 12345)
 
         assert file_path.exists()
         assert file_path.name == "12345.jpg"
 
         # Verify content
-        with open(file_path, "rb") as f:
-            saved_data = f.read()
-        assert saved_data == image_data
+        assert file_path.read_bytes() == image_data
 
-    def test_write_manifest(self, temp_data_lake):
+    def test_write_manifest(self, shared_data_lake):
         """Test writing manifest file."""
         stats = {"channel1": 100, "channel2": 50}
 
-        manifest_path = temp_data_lake.write_manifest("2026-01-18", stats)
+        # Each manifest test owns a date so merges don't see other tests' counts
+        manifest_path = shared_data_lake.write_manifest("2026-01-18", stats)
 
         assert manifest_path.exists()
         assert manifest_path.name == "_manifest.json"
 
         # Verify content
-        with open(manifest_path, "r") as f:
-            manifest = json.load(f)
+        manifest = json.loads(manifest_path.read_bytes())
         assert manifest["date"] == "2026-01-18"
         assert manifest["total_messages"] == 150
         assert manifest["channels"] == stats
 
+    def test_write_manifest_merges_wal_entries(self, shared_data_lake):
+        """Test pending WAL entries are folded into the manifest."""
+        shared_data_lake.append_manifest_entry("2026-01-19", "channel1", 100)
+        wal_path = shared_data_lake.append_manifest_entry("2026-01-19", "channel2", 50)
+
+        manifest_path = shared_data_lake.write_manifest("2026-01-19", {"channel3": 25})
+
+        manifest = json.loads(manifest_path.read_bytes())
+        assert manifest["channels"] == {"channel1": 100, "channel2": 50, "channel3": 25}
+        assert manifest["total_messages"] == 175
+        assert not wal_path.exists()
+
     def test_get_scraped_dates(self, temp_data_lake):
         """Test getting list of scraped dates."""
         # Create some date directories
-        temp_data_lake.get_messages_partition_dir("2026-01-15")
-        temp_data_lake.get_messages_partition_dir("2026-01-16")
-        temp_data_lake.get_messages_partition_dir("2026-01-17")
+        messages_dir = temp_data_lake.base_path / "raw" / "telegram_messages"
+        for date_str in ("2026-01-15", "2026-01-16", "2026-01-17"):
+            (messages_dir / date_str).mkdir(parents=True, exist_ok=True)
 
         dates = temp_data_lake.get_scraped_dates()
 
@@ -101,9 +182,9 @@ class TestDataLakeManager:
         assert "2026-01-16" in dates
         assert "2026-01-17" in dates
 
-    def test_validate_structure_success(self, temp_data_lake):
+    def test_validate_structure_success(self, shared_data_lake):
         """Test structure validation succeeds for valid structure."""
-        assert temp_data_lake.validate_structure() is True
+        assert shared_data_lake.validate_structure() is True
 
     def test_validate_structure_fails_on_missing_dir(self, tmp_path):
         """Test structure validation fails if directory missing."""
@@ -6,28 +6,47 @@ Tests data loading, validation, and duplicate checking.
 
 import pytest
 import json
-from unittest.mock import Mock, patch, MagicMock, mock_open
+from unittest.mock import Mock, patch
 from datetime import datetime
 from pathlib import Path
 from src.database.data_loader import DataLoader
 from src.database.db_connector import DatabaseConnector
 
+_SQL_MARKER = "CREATE TABLE IF NOT EXISTS raw.telegram_messages"
+
+_BASE = {
+    "message_id": 0,
+    "channel_name": "test",
+    "message_date": "2026-01-18T10:00:00",
+}
+
+
+def msg(i, **kw):
+    """Return a valid message dict with the given id and overrides."""
+    return {**_BASE, "message_id": i, **kw}
+
 
 class TestDataLoader:
     """Test suite for DataLoader class."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def mock_db_connector(self):
-        """Fixture for mocked DatabaseConnector."""
+        """Fixture for mocked DatabaseConnector, specced once per session."""
         mock_db = Mock(spec=DatabaseConnector)
         mock_db.connection_pool = True  # Simulate connected state
         return mock_db
 
-    @pytest.fixture
+    @pytest.fixture(scope="session")
     def data_loader(self, mock_db_connector):
         """Fixture for DataLoader instance with mocked DB."""
         return DataLoader(db_connector=mock_db_connector)
 
+    @pytest.fixture(autouse=True)
+    def _reset_db_connector(self, mock_db_connector):
+        """Clear calls and configured results on the shared mock after each test."""
+        yield
+        mock_db_connector.reset_mock(return_value=True, side_effect=True)
+
     def test_init_with_connector(self, mock_db_connector):
         """Test DataLoader initialization with provided connector."""
         # Act
@@ -40,8 +59,7 @@ class TestDataLoader:
     def test_init_without_connector(self, mock_db_class):
         """Test DataLoader initialization creates new connector if not provided."""
         # Arrange
-        mock_instance = Mock()
-        mock_instance.connection_pool = None
+        mock_instance = Mock(connection_pool=None)
         mock_db_class.return_value = mock_instance
 
         # Act
@@ -59,7 +77,7 @@ class TestDataLoader:
         # Assert
         mock_db_connector.execute_query.assert_called_once()
         call_args = mock_db_connector.execute_query.call_args
-        assert "CREATE TABLE IF NOT EXISTS raw.telegram_messages" in call_args[0][0]
+        assert _SQL_MARKER in call_args[0][0]
 
     def test_check_duplicates_empty_list(self, data_loader):
         """Test check_duplicates with empty list returns empty."""
@@ -83,50 +101,18 @@ class TestDataLoader:
         # Assert
         assert result == [1, 2]
 
-    def test_validate_message_data_valid(self, data_loader):
-        """Test _validate_message_data with valid message."""
-        # Arrange
-        message = {
-            "message_id": 123,
-            "channel_name": "test_channel",
-            "message_date": "2026-01-18T10:00:00",
-        }
-
-        # Act
-        result = data_loader._validate_message_data(message)
-
-        # Assert
-        assert result is True
-
-    def test_validate_message_data_missing_field(self, data_loader):
-        """Test _validate_message_data with missing required field."""
-        # Arrange
-        message = {
-            "message_id": 123,
-            "channel_name": "test_channel",
-            # missing message_date
-        }
-
-        # Act
-        result = data_loader._validate_message_data(message)
-
-        # Assert
-        assert result is False
-
-    def test_validate_message_data_invalid_id(self, data_loader):
-        """Test _validate_message_data with invalid message_id."""
-        # Arrange
-        message = {
-            "message_id": "not_a_number",
-            "channel_name": "test_channel",
-            "message_date": "2026-01-18T10:00:00",
-        }
-
-        # Act
-        result = data_loader._validate_message_data(message)
-
-        # Assert
-        assert result is False
+    @pytest.mark.parametrize(
+        "message,expected",
+        [
+            (msg(123), True),
+            ({"message_id": 123, "channel_name": "test"}, False),
+            (msg("not_a_number"), False),
+        ],
+        ids=["valid", "missing_field", "invalid_id"],
+    )
+    def test_validate_message_data(self, data_loader, message, expected):
+        """Test _validate_message_data accepts only complete, numeric-id messages."""
+        assert data_loader._validate_message_data(message) is expected
 
     def test_bulk_insert_empty_list(self, data_loader):
         """Test bulk_insert with empty list returns 0."""
@@ -139,18 +125,7 @@ class TestDataLoader:
     def test_bulk_insert_all_duplicates(self, data_loader, mock_db_connector):
         """Test bulk_insert skips all duplicate messages."""
         # Arrange
-        messages = [
-            {
-                "message_id": 1,
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
-            {
-                "message_id": 2,
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
-        ]
+        messages = [msg(1), msg(2)]
         mock_db_connector.execute_query.return_value = [
             {"message_id": 1},
             {"message_id": 2},
@@ -165,18 +140,7 @@ class TestDataLoader:
     def test_bulk_insert_new_messages(self, data_loader, mock_db_connector):
         """Test bulk_insert inserts new messages."""
         # Arrange
-        messages = [
-            {
-                "message_id": 1,
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
-            {
-                "message_id": 2,
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
-        ]
+        messages = [msg(1), msg(2)]
         mock_db_connector.execute_query.return_value = []  # No duplicates
 
         # Act
@@ -184,22 +148,14 @@ class TestDataLoader:
 
         # Assert
         assert result == 2
-        mock_db_connector.execute_many.assert_called_once()
+        mock_db_connector.execute_values.assert_called_once()
 
     def test_bulk_insert_filters_invalid(self, data_loader, mock_db_connector):
         """Test bulk_insert filters out invalid messages."""
         # Arrange
         messages = [
-            {
-                "message_id": 1,
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
-            {
-                "message_id": "invalid",
-                "channel_name": "test",
-                "message_date": "2026-01-18T10:00:00",
-            },
+            msg(1),
+            msg("invalid"),
             {"channel_name": "test"},  # missing message_id
         ]
         mock_db_connector.execute_query.return_value = []
@@ -210,41 +166,43 @@ class TestDataLoader:
         # Assert
         assert result == 1  # Only 1 valid message
 
-    @patch("pathlib.Path.rglob")
-    @patch("pathlib.Path.is_dir")
-    @patch("pathlib.Path.is_file")
-    @patch("pathlib.Path.exists")
-    @patch(
-        "builtins.open",
-        new_callable=mock_open,
-        read_data='{"message_id": 1, "channel_name": "test", "message_date": "2026-01-18"}',
-    )
     def test_load_json_to_postgres_single_file(
-        self,
-        mock_file,
-        mock_exists,
-        mock_is_file,
-        mock_is_dir,
-        mock_rglob,
-        data_loader,
-        mock_db_connector,
+        self, data_loader, mock_db_connector, tmp_path
     ):
         """Test load_json_to_postgres with single JSON file."""
         # Arrange
-        mock_exists.return_value = True
-        mock_is_file.return_value = True
-        mock_is_dir.return_value = False
+        json_file = tmp_path / "test.json"
+        json_file.write_text(
+            '{"message_id": 1, "channel_name": "test", "message_date": "2026-01-18"}',
+            encoding="utf-8",
+        )
         mock_db_connector.execute_query.return_value = []
 
         # Act
-        with patch.object(
-            Path, "suffix", new_callable=lambda: property(lambda self: ".json")
-        ):
-            result = data_loader.load_json_to_postgres("test.json")
+        result = data_loader.load_json_to_postgres(str(json_file))
 
         # Assert
         assert result == 1
 
+    def test_load_json_to_postgres_ndjson_file(
+        self, data_loader, mock_db_connector, tmp_path
+    ):
+        """Test load_json_to_postgres reads streamed NDJSON files line by line."""
+        # Arrange
+        ndjson_file = tmp_path / "test.jsonl"
+        ndjson_file.write_text(
+            '{"message_id": 1, "channel_name": "test", "message_date": "2026-01-18"}\n'
+            '{"message_id": 2, "channel_name": "test", "message_date": "2026-01-18"}\n',
+            encoding="utf-8",
+        )
+        mock_db_connector.execute_query.return_value = []
+
+        # Act
+        result = data_loader.load_json_to_postgres(str(ndjson_file))
+
+        # Assert
+        assert result == 2
+
     @patch("pathlib.Path.exists")
     def test_load_json_to_postgres_path_not_found(self, mock_exists, data_loader):
         """Test load_json_to_postgres raises error for non-existent path."""
@@ -4,10 +4,26 @@ Unit tests for DatabaseConnector class.
 Tests database connection, schema creation, and query execution.
 """
 
+import threading
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
-from psycopg2 import pool, Error
+from psycopg2 import pool, Error, OperationalError
+from psycopg2.pool import PoolError
+from psycopg2.extras import RealDictCursor
 from src.database.db_connector import DatabaseConnector
+from tests._fakes import FakeConn, FakeCursor, FakePool
+
+
+def connect_fake(db_connector, fetchall_result=None):
+    """Connect db_connector to a FakePool and return the pool."""
+    fake_pool = FakePool(FakeConn(FakeCursor(fetchall_result)))
+    with patch(
+        "src.database.db_connector.pool.ThreadedConnectionPool",
+        return_value=fake_pool,
+    ):
+        db_connector.connect()
+    return fake_pool
 
 
 class TestDatabaseConnector:
@@ -33,7 +49,7 @@ class TestDatabaseConnector:
         assert db_connector.password == "test_password"
         assert db_connector.connection_pool is None
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
     def test_connect_success(self, mock_pool, db_connector):
         """Test successful database connection."""
         # Arrange
@@ -47,7 +63,7 @@ class TestDatabaseConnector:
         mock_pool.assert_called_once()
         assert db_connector.connection_pool is not None
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
     def test_connect_failure(self, mock_pool, db_connector):
         """Test database connection failure."""
         # Arrange
@@ -57,7 +73,7 @@ class TestDatabaseConnector:
         with pytest.raises(Error):
             db_connector.connect()
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
     def test_get_connection(self, mock_pool, db_connector):
         """Test get_connection context manager."""
         # Arrange
@@ -77,114 +93,211 @@ class TestDatabaseConnector:
         # Assert
         mock_pool_instance.putconn.assert_called_once_with(mock_conn)
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_create_schemas(self, mock_pool, db_connector):
-        """Test create_schemas creates default schemas."""
+    def test_init_pool_sizing(self):
+        """Test pool bounds default from CPU count and can be overridden."""
+        default = DatabaseConnector()
+        sized = DatabaseConnector(minconn=4, maxconn=32)
+
+        assert default.minconn == 2
+        assert default.maxconn >= 3
+        assert (sized.minconn, sized.maxconn) == (4, 32)
+
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
+    def test_connect_keeps_explicit_zero_minconn(self, mock_pool, db_connector):
+        """Test connect passes an explicit min_connections=0 through."""
+        db_connector.connect(min_connections=0)
+
+        assert mock_pool.call_args[0][:2] == (0, db_connector.maxconn)
+
+    def test_get_connection_stays_within_maxconn(self):
+        """Test concurrent checkouts are bounded by maxconn and all returned."""
         # Arrange
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        maxconn = 3
+        db_connector = DatabaseConnector(minconn=1, maxconn=maxconn)
+        with patch(
+            "src.database.db_connector.pool.ThreadedConnectionPool",
+            side_effect=lambda minconn, maxconn, **kwargs: FakePool(maxconn=maxconn),
+        ):
+            db_connector.connect()
+        fake_pool = db_connector.connection_pool
+        # Every worker holds its connection until all of them have one
+        all_checked_out = threading.Barrier(maxconn)
+
+        def worker():
+            with db_connector.get_connection():
+                all_checked_out.wait(timeout=5)
+
+        # Act
+        threads = [threading.Thread(target=worker) for _ in range(maxconn)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        # Assert
+        assert fake_pool.peak_in_use == maxconn
+        assert fake_pool.in_use == 0
+        for _ in range(maxconn):
+            fake_pool.getconn()
+        with pytest.raises(PoolError):
+            with db_connector.get_connection():
+                pass
+
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
+    def test_get_connection_retries_on_dead_conn(self, mock_pool):
+        """Test a connection failing the health check is replaced once."""
+        # Arrange
+        db_connector = DatabaseConnector(health_check=True)
+        dead_conn = Mock(closed=0)
+        dead_conn.cursor.side_effect = OperationalError("server closed")
+        live_conn = MagicMock(closed=0)
         mock_pool_instance = Mock()
-        mock_pool_instance.getconn.return_value = mock_conn
         mock_pool.return_value = mock_pool_instance
         db_connector.connect()
+        mock_pool_instance.getconn.reset_mock()
+        mock_pool_instance.putconn.reset_mock()
+        mock_pool_instance.getconn.side_effect = [dead_conn, live_conn]
+
+        # Act
+        with db_connector.get_connection() as conn:
+            assert conn is live_conn
+
+        # Assert
+        assert mock_pool_instance.getconn.call_count == 2
+        mock_pool_instance.putconn.assert_any_call(dead_conn, close=True)
+        mock_pool_instance.putconn.assert_called_with(live_conn)
+
+    def test_create_schemas(self, db_connector):
+        """Test create_schemas creates default schemas."""
+        # Arrange
+        fake_pool = connect_fake(db_connector)
+        cursor = fake_pool.conn.cursor_obj
 
         # Act
         db_connector.create_schemas()
 
         # Assert
-        assert mock_cursor.execute.call_count == 3  # raw, staging, marts
+        assert cursor.execute_calls == 1
+        rendered = repr(cursor.statements[0][0])
+        for schema in ("raw", "staging", "marts"):
+            assert f"Identifier('{schema}')" in rendered
+        assert fake_pool.conn.commit_calls == 1
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_execute_query_with_fetch(self, mock_pool, db_connector):
+    def test_execute_query_with_fetch(self, db_connector):
         """Test execute_query returns results when fetch=True."""
         # Arrange
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [{"id": 1}, {"id": 2}]
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool_instance = Mock()
-        mock_pool_instance.getconn.return_value = mock_conn
-        mock_pool.return_value = mock_pool_instance
-        db_connector.connect()
+        fake_pool = connect_fake(db_connector, fetchall_result=[{"id": 1}, {"id": 2}])
 
         # Act
         results = db_connector.execute_query("SELECT * FROM test", fetch=True)
 
         # Assert
         assert len(results) == 2
-        mock_cursor.execute.assert_called_once()
+        assert fake_pool.conn.cursor_obj.execute_calls == 1
+
+    def test_execute_query_uses_dict_cursor_factory(self, db_connector):
+        """Test execute_query checks out a connection with RealDictCursor."""
+        # Arrange
+        fake_pool = connect_fake(db_connector, fetchall_result=[{"id": 1}])
+
+        # Act
+        db_connector.execute_query("SELECT * FROM test", fetch=True)
+
+        # Assert
+        assert fake_pool.conn.cursor_factories == [RealDictCursor]
+        assert fake_pool.conn.cursor_factory is None
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_execute_query_without_fetch(self, mock_pool, db_connector):
+    def test_execute_query_without_fetch(self, db_connector):
         """Test execute_query commits when fetch=False."""
         # Arrange
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool_instance = Mock()
-        mock_pool_instance.getconn.return_value = mock_conn
-        mock_pool.return_value = mock_pool_instance
-        db_connector.connect()
+        fake_pool = connect_fake(db_connector)
 
         # Act
         result = db_connector.execute_query("INSERT INTO test VALUES (1)", fetch=False)
 
         # Assert
         assert result is None
-        mock_conn.commit.assert_called_once()
+        assert fake_pool.conn.commit_calls == 1
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_execute_many(self, mock_pool, db_connector):
+    @patch("src.database.db_connector.execute_batch")
+    def test_execute_many(self, mock_execute_batch, db_connector):
         """Test execute_many for bulk operations."""
         # Arrange
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool_instance = Mock()
-        mock_pool_instance.getconn.return_value = mock_conn
-        mock_pool.return_value = mock_pool_instance
-        db_connector.connect()
+        fake_pool = connect_fake(db_connector)
         data = [(1, "a"), (2, "b")]
 
         # Act
         db_connector.execute_many("INSERT INTO test VALUES (%s, %s)", data)
 
         # Assert
-        mock_cursor.executemany.assert_called_once()
-        mock_conn.commit.assert_called_once()
+        mock_execute_batch.assert_called_once_with(
+            fake_pool.conn.cursor_obj,
+            "INSERT INTO test VALUES (%s, %s)",
+            data,
+            page_size=500,
+        )
+        assert fake_pool.conn.commit_calls == 1
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_table_exists_true(self, mock_pool, db_connector):
-        """Test table_exists returns True for existing table."""
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
+    def test_execute_values_pages_rows(self, mock_pool, db_connector):
+        """Test execute_values sends one multi-row statement per page."""
         # Arrange
         mock_conn = MagicMock()
         mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [{"exists": True}]
+        mock_cursor.connection.encoding = "UTF8"
+        mock_cursor.mogrify.side_effect = lambda template, args: repr(args).encode()
         mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
         mock_pool_instance = Mock()
         mock_pool_instance.getconn.return_value = mock_conn
         mock_pool.return_value = mock_pool_instance
         db_connector.connect()
+        data = [(i, "x") for i in range(5)]
+
+        # Act
+        db_connector.execute_values("INSERT INTO test VALUES %s", data, page_size=2)
+
+        # Assert
+        statements = [c.args[0] for c in mock_cursor.execute.call_args_list]
+        assert len(statements) == 3  # pages of 2, 2 and 1 rows
+        assert statements[-1] == b"INSERT INTO test VALUES (4, 'x')"
+        mock_conn.commit.assert_called_once()
+
+    def test_table_exists_true(self, db_connector):
+        """Test table_exists returns True for existing table."""
+        # Arrange
+        fake_pool = connect_fake(db_connector, fetchall_result=[{"exists": True}])
+
+        # Act
+        result = db_connector.table_exists("test_table", "public")
+        again = db_connector.table_exists("test_table", "public")
+
+        # Assert
+        assert result is True and again is True
+        statements = [query for query, _ in fake_pool.conn.cursor_obj.statements]
+        assert sum("PREPARE te_exists" in q for q in statements) == 1
+        assert statements.count("EXECUTE te_exists(%s, %s)") == 2
+        assert fake_pool.conn.rollback_calls == 2
+
+    def test_table_exists_rolls_back_on_error(self, db_connector):
+        """Test a failed check does not return an aborted transaction to the pool."""
+        # Arrange
+        fake_pool = connect_fake(db_connector)
+        cursor = fake_pool.conn.cursor_obj
+        cursor.fetchall = Mock(side_effect=Error("relation lookup failed"))
+        putconn_calls = fake_pool.putconn_calls
 
         # Act
         result = db_connector.table_exists("test_table", "public")
 
         # Assert
-        assert result is True
+        assert result is False
+        assert fake_pool.conn.rollback_calls == 1
+        assert fake_pool.putconn_calls == putconn_calls + 1
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
-    def test_table_exists_false(self, mock_pool, db_connector):
+    def test_table_exists_false(self, db_connector):
         """Test table_exists returns False for non-existing table."""
         # Arrange
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [{"exists": False}]
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_pool_instance = Mock()
-        mock_pool_instance.getconn.return_value = mock_conn
-        mock_pool.return_value = mock_pool_instance
-        db_connector.connect()
+        connect_fake(db_connector, fetchall_result=[{"exists": False}])
 
         # Act
         result = db_connector.table_exists("nonexistent", "public")
@@ -192,7 +305,7 @@ class TestDatabaseConnector:
         # Assert
         assert result is False
 
-    @patch("src.database.db_connector.pool.SimpleConnectionPool")
+    @patch("src.database.db_connector.pool.ThreadedConnectionPool")
     def test_close(self, mock_pool, db_connector):
         """Test close closes connection pool."""
         # Arrange
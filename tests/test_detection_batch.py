@@ -0,0 +1,85 @@
+"""Tests for DetectionBatch class."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from src.yolo.detection_batch import DetectionBatch
+from src.yolo.detection_manager import DetectionManager
+from src.yolo.image_classifier import ImageClassifier
+
+
+class TestDetectionBatch:
+    """Test suite for DetectionBatch class."""
+
+    @pytest.fixture
+    def detections(self):
+        """Fixture for list-of-dicts detections."""
+        return [
+            {"class": "person", "confidence": 0.5, "bbox": [1, 2, 3, 4], "class_id": 0},
+            {
+                "class": "bottle",
+                "confidence": 0.75,
+                "bbox": [5, 6, 7, 8],
+                "class_id": 39,
+            },
+            {
+                "class": "person",
+                "confidence": 0.25,
+                "bbox": [0, 0, 1, 1],
+                "class_id": 0,
+            },
+        ]
+
+    def test_from_dicts_round_trip(self, detections):
+        """Test converting dicts to arrays and back."""
+        batch = DetectionBatch.from_dicts(detections)
+
+        assert len(batch) == 3
+        assert batch.class_ids.dtype == np.int16
+        assert batch.bboxes.shape == (3, 4)
+        assert [d["class"] for d in batch.as_dicts()] == ["person", "bottle", "person"]
+        assert batch.as_dicts()[1]["bbox"] == [5.0, 6.0, 7.0, 8.0]
+
+    def test_summary_matches_dict_version(self, detections):
+        """Test that the array summary matches the dict-based counts."""
+        summary = DetectionBatch.from_dicts(detections).summary()
+
+        assert summary["total_objects"] == 3
+        assert summary["unique_classes"] == ["person", "bottle"]
+        assert summary["class_counts"] == {"person": 2, "bottle": 1}
+        assert summary["avg_confidence"] == pytest.approx(0.5)
+        assert summary["high_confidence"] == 1
+
+    def test_empty_batch(self):
+        """Test that an empty batch summarizes and classifies as empty."""
+        batch = DetectionBatch.empty()
+
+        assert batch.summary()["total_objects"] == 0
+        assert ImageClassifier().classify_image(batch) == "other"
+
+    def test_identity_equality_and_hash(self, detections):
+        """Test batches compare by identity and can be hashed."""
+        batch = DetectionBatch.from_dicts(detections)
+        other = DetectionBatch.from_dicts(detections)
+
+        assert batch == batch
+        assert batch != other
+        assert hash(batch) != hash(other)
+
+    def test_consumers_accept_batches(self, detections, tmp_path):
+        """Test that classifier and CSV writer take batches directly."""
+        batch = DetectionBatch.from_dicts(detections)
+        output_file = tmp_path / "detections.csv"
+
+        category = ImageClassifier().classify_image(batch)
+        DetectionManager().save_results_to_csv(
+            {"data/raw/images/channel1/123.jpg": batch}, str(output_file)
+        )
+
+        with open(output_file, "r") as f:
+            rows = list(csv.DictReader(f))
+
+        assert category == "promotional"
+        assert [row["detected_class"] for row in rows] == ["person", "bottle", "person"]
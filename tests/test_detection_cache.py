@@ -0,0 +1,63 @@
+"""Tests for DetectionCache class."""
+
+import os
+
+import pytest
+
+from src.yolo.cache import DetectionCache
+
+
+class TestDetectionCache:
+    """Test suite for DetectionCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Fixture for a DetectionCache backed by a temporary database."""
+        cache = DetectionCache(str(tmp_path / "cache.sqlite"), "yolov8n.pt")
+        yield cache
+        cache.close()
+
+    @pytest.fixture
+    def image(self, tmp_path):
+        """Fixture for a small image file."""
+        image = tmp_path / "123.jpg"
+        image.write_bytes(b"fake image bytes")
+        return str(image)
+
+    def test_get_miss(self, cache, image):
+        """Test that an unseen image is a miss."""
+        assert cache.get(image, 0.25) is None
+
+    def test_put_then_get(self, cache, image):
+        """Test that stored detections are returned for the same settings."""
+        detections = [{"class": "bottle", "confidence": 0.8, "bbox": [1, 2, 3, 4]}]
+
+        cache.put(image, 0.25, detections)
+
+        assert cache.get(image, 0.25) == detections
+        assert cache.get(image, 0.5) is None
+
+    def test_keyed_on_content(self, cache, image, tmp_path):
+        """Test that a copy of an image hits and a modified image misses."""
+        cache.put(image, 0.25, [])
+        copy = tmp_path / "456.jpg"
+        copy.write_bytes(b"fake image bytes")
+
+        assert cache.get(str(copy), 0.25) == []
+
+        with open(image, "wb") as f:
+            f.write(b"different bytes")
+        st = os.stat(image)
+        os.utime(image, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+
+        assert cache.get(image, 0.25) is None
+
+    def test_keyed_on_precision(self, cache, image, tmp_path):
+        """Test that detections from another precision are not served."""
+        cache.put(image, 0.25, [])
+        int8_cache = DetectionCache(
+            str(tmp_path / "cache.sqlite"), "yolov8n.pt", precision="int8"
+        )
+
+        assert int8_cache.get(image, 0.25) is None
+        int8_cache.close()
@@ -3,10 +3,16 @@
 import pytest
 import csv
 import json
+import os
+import shutil
 from pathlib import Path
-from unittest.mock import Mock, patch, mock_open
+from unittest.mock import MagicMock, Mock, patch
 
-from src.yolo.detection_manager import DetectionManager
+from src.yolo.detection_manager import (
+    CSV_FIELDNAMES,
+    DetectionManager,
+    _split_image_path,
+)
 
 
 class TestDetectionManager:
@@ -51,8 +57,9 @@ class TestDetectionManager:
             reader = csv.DictReader(f)
             rows = list(reader)
 
-        # Should have 3 detections (2 from first image, 1 from second, 1 empty for third)
-        assert len(rows) == 4
+        # 2 detections from the first image, 1 from the second; the empty
+        # third image writes no row
+        assert len(rows) == 3
 
         # Check first detection
         assert rows[0]["channel_name"] == "channel1"
@@ -72,6 +79,87 @@ class TestDetectionManager:
         # Assert - file should not be created or be empty
         # Manager logs a warning but doesn't create file
 
+    def test_open_csv_writer_streams_rows(self, manager, tmp_path):
+        """Test writing detections image by image through the CSV writer."""
+        # Arrange
+        output_file = tmp_path / "detections.csv"
+
+        # Act
+        with manager.open_csv_writer(str(output_file)) as writer:
+            assert not output_file.exists()
+            writer.write_image(
+                "data/raw/images/channel1/123.jpg",
+                [{"class": "bottle", "confidence": 0.8, "bbox": [1, 2, 3, 4]}],
+            )
+            writer.write_image("data/raw/images/channel1/789.jpg", [])
+            writer.write_image(
+                "data/raw/images/channel2/456.jpg",
+                [{"class": "cup", "confidence": 0.7, "bbox": [5, 6, 7, 8]}],
+            )
+
+        # Assert
+        with open(output_file, "r") as f:
+            rows = list(csv.DictReader(f))
+
+        assert writer.count == 2
+        assert [row["message_id"] for row in rows] == ["123", "456"]
+        assert rows[0]["bbox_x2"] == "3"
+        assert rows[0]["timestamp"] == rows[1]["timestamp"]
+
+    def test_open_csv_writer_classifies_each_image(self, manager, tmp_path):
+        """Test a writer given a classifier categorizes every image it writes."""
+        from src.yolo.image_classifier import ImageClassifier
+
+        # Arrange
+        output_file = tmp_path / "detections.csv"
+
+        # Act
+        with manager.open_csv_writer(str(output_file), ImageClassifier()) as writer:
+            writer.write_image(
+                "data/raw/images/channel1/123.jpg",
+                [{"class": "bottle", "confidence": 0.8, "bbox": [1, 2, 3, 4]}],
+            )
+            writer.write_image("data/raw/images/channel1/789.jpg", [])
+
+        # Assert
+        assert writer.categories == {
+            "data/raw/images/channel1/123.jpg": "product_display",
+            "data/raw/images/channel1/789.jpg": "other",
+        }
+
+    def test_save_results_to_csv_schema(self, manager, tmp_path):
+        """Test the CSV header and that images without detections get no row."""
+        # Arrange
+        output_file = tmp_path / "detections.csv"
+        results = {
+            "data/raw/images/channel1/789.jpg": [],
+            "data/raw/images/channel1/123.jpg": [
+                {"class": "bottle", "confidence": 0.8, "bbox": [1, 2, 3, 4]}
+            ],
+        }
+
+        # Act
+        manager.save_results_to_csv(results, str(output_file))
+
+        # Assert
+        with open(output_file, "r", newline="") as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0] == list(CSV_FIELDNAMES)
+        assert rows[1][:9] == [
+            "data/raw/images/channel1/123.jpg",
+            "channel1",
+            "123",
+            "bottle",
+            "0.8",
+            "1",
+            "2",
+            "3",
+            "4",
+        ]
+        assert rows[1][9] == "1"  # total_objects
+        assert len(rows) == 2
+
     def test_save_results_to_json(self, manager, sample_batch_results, tmp_path):
         """Test saving detection results to JSON."""
         # Arrange
@@ -92,6 +180,24 @@ class TestDetectionManager:
         assert data["metadata"]["total_detections"] == 3
         assert data["results"] == sample_batch_results
 
+    @pytest.mark.parametrize("results", [{}, {1: []}, None])
+    def test_save_results_to_json_indented(
+        self, manager, sample_batch_results, tmp_path, results
+    ):
+        """Test the streamed JSON is laid out like json.dump with indent=2."""
+        # Arrange
+        output_file = tmp_path / "detections.json"
+        results = sample_batch_results if results is None else results
+
+        # Act
+        manager.save_results_to_json(results, str(output_file))
+
+        # Assert
+        text = output_file.read_text()
+        data = json.loads(text)
+        assert text == json.dumps(data, indent=2)
+        assert data["results"] == {str(k): v for k, v in results.items()}
+
     def test_load_results_from_json(self, manager, sample_batch_results, tmp_path):
         """Test loading detection results from JSON."""
         # Arrange
@@ -138,7 +244,12 @@ class TestDetectionManager:
         assert db_records[0]["detected_class"] == "person"
         assert db_records[0]["confidence"] == 0.9
         assert db_records[0]["image_category"] == "promotional"
-        assert "bbox" in db_records[0]
+        assert (
+            db_records[0]["bbox_x1"],
+            db_records[0]["bbox_y1"],
+            db_records[0]["bbox_x2"],
+            db_records[0]["bbox_y2"],
+        ) == (100.0, 100.0, 200.0, 200.0)
         assert "processed_at" in db_records[0]
 
     def test_get_statistics(self, manager, sample_batch_results):
@@ -187,6 +298,65 @@ class TestDetectionManager:
         # Assert
         assert output_csv.exists()
 
+    def test_merge_with_messages_refuses_same_file(self, manager, tmp_path):
+        """Test merging a CSV onto itself raises instead of truncating it."""
+        # Arrange
+        input_csv = tmp_path / "detections.csv"
+        input_csv.write_text("message_id,detected_class\n123,person\n")
+
+        # Act / Assert
+        with pytest.raises(shutil.SameFileError):
+            manager.merge_with_messages(str(input_csv), str(input_csv))
+        assert input_csv.read_text() == "message_id,detected_class\n123,person\n"
+
+    @pytest.mark.skipif(not hasattr(os, "sendfile"), reason="needs os.sendfile")
+    @patch("src.yolo.detection_manager.fcntl", None)
+    def test_merge_with_messages_short_sendfile_falls_back(self, manager, tmp_path):
+        """Test a sendfile that stops early still produces a full copy."""
+        # Arrange
+        input_csv = tmp_path / "detections.csv"
+        output_csv = tmp_path / "merged.csv"
+        input_csv.write_text("message_id,detected_class\n123,person\n")
+        # Only the first call stops early; shutil's own copy uses sendfile too
+        real_sendfile = os.sendfile
+        calls = []
+
+        def short_sendfile(*args):
+            calls.append(args)
+            return 0 if len(calls) == 1 else real_sendfile(*args)
+
+        # Act
+        with patch("os.sendfile", side_effect=short_sendfile):
+            manager.merge_with_messages(str(input_csv), str(output_csv))
+
+        # Assert
+        assert output_csv.read_bytes() == input_csv.read_bytes()
+
+    def test_merge_with_messages_copies_through_database(self, manager, tmp_path):
+        """Test merging streams the CSV in and out of PostgreSQL with COPY."""
+        # Arrange
+        input_csv = tmp_path / "detections.csv"
+        output_csv = tmp_path / "merged.csv"
+        input_csv.write_text("message_id,detected_class\n123,person\n")
+
+        mock_cursor = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_db = MagicMock()
+        mock_db.get_connection.return_value.__enter__.return_value = mock_conn
+
+        # Act
+        manager.merge_with_messages(str(input_csv), str(output_csv), mock_db)
+
+        # Assert
+        assert mock_cursor.copy_expert.call_count == 2
+        copy_in, copy_out = mock_cursor.copy_expert.call_args_list
+        assert "FROM STDIN" in copy_in.args[0]
+        assert "TO STDOUT" in copy_out.args[0]
+        assert "raw.telegram_messages" in copy_out.args[0]
+        mock_conn.commit.assert_called_once()
+        assert output_csv.exists()
+
     def test_save_results_csv_extracts_identifiers(self, manager, tmp_path):
         """Test that CSV saving correctly extracts channel and message IDs from paths."""
         # Arrange
@@ -208,6 +378,48 @@ class TestDetectionManager:
         assert row["channel_name"] == "my_channel"
         assert row["message_id"] == "msg_999"
 
+    def test_prepare_for_database_iter_matches_list(
+        self, manager, sample_batch_results
+    ):
+        """Test the generator yields the same records as prepare_for_database."""
+        categories = {"data/raw/images/channel1/123.jpg": "promotional"}
+
+        records = manager.prepare_for_database(sample_batch_results, categories)
+        streamed = manager.prepare_for_database_iter(sample_batch_results, categories)
+
+        assert not isinstance(streamed, list)
+        streamed = list(streamed)
+        for record in records + streamed:
+            record.pop("processed_at")
+        assert streamed == records
+
+    def test_save_and_prepare_matches_separate_passes(
+        self, manager, sample_batch_results, tmp_path
+    ):
+        """Test the fused pass writes the same CSV and records as three passes."""
+        from src.yolo.image_classifier import ImageClassifier
+
+        # Arrange
+        classifier = ImageClassifier()
+        separate_csv = tmp_path / "separate.csv"
+        fused_csv = tmp_path / "fused.csv"
+        categories = classifier.classify_batch(sample_batch_results)
+        manager.save_results_to_csv(sample_batch_results, str(separate_csv))
+        records = manager.prepare_for_database(sample_batch_results, categories)
+
+        # Act
+        fused = manager.save_and_prepare(
+            sample_batch_results, classifier, str(fused_csv)
+        )
+
+        # Assert
+        for record in records + fused:
+            record.pop("processed_at")
+        assert fused == records
+        with open(separate_csv, newline="") as f1, open(fused_csv, newline="") as f2:
+            # Drop the per-writer timestamp column before comparing
+            assert [r[:-1] for r in csv.reader(f1)] == [r[:-1] for r in csv.reader(f2)]
+
     def test_prepare_for_database_handles_missing_category(self, manager):
         """Test that prepare_for_database handles missing category gracefully."""
         # Arrange
@@ -224,3 +436,17 @@ class TestDetectionManager:
         # Assert
         assert len(db_records) == 1
         assert db_records[0]["image_category"] == "other"  # Default value
+
+    def test_split_image_path_is_cached(self):
+        """Test that repeated image paths are parsed once."""
+        # Arrange
+        _split_image_path.cache_clear()
+        image_path = "data/raw/images/channel1/123.jpg"
+
+        # Act
+        first = _split_image_path(image_path)
+        second = _split_image_path(image_path)
+
+        # Assert
+        assert first == second == ("123", "channel1")
+        assert _split_image_path.cache_info().hits == 1
@@ -0,0 +1,24 @@
+"""Tests for the JSON encoding helpers."""
+
+import pytest
+from unittest.mock import patch
+
+from src.utils.json_io import dump_json_bytes, load_json_bytes
+
+SAMPLE = {"channel": "CheMed123", "count": 3, "text": "Аптека", "items": [1.5, None]}
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"indent": True}, {"newline": True}, {"indent": True, "newline": True}],
+)
+def test_fallback_matches_orjson(options):
+    """Test the json module fallback writes the same bytes as orjson."""
+    pytest.importorskip("orjson")
+    fast = dump_json_bytes(SAMPLE, **options)
+
+    with patch("src.utils.json_io.orjson", None):
+        slow = dump_json_bytes(SAMPLE, **options)
+
+    assert fast == slow
+    assert load_json_bytes(fast) == SAMPLE
@@ -1,16 +1,61 @@
 """Tests for YOLO modules (simplified)."""
 
+import numpy as np
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
 
-from src.yolo.yolo_detector import YOLODetector
+from src.yolo.yolo_detector import YOLODetector, _load_model
 from src.yolo.image_classifier import ImageClassifier
 
 
 class TestYOLODetector:
     """Test suite for YOLODetector class."""
 
+    @pytest.fixture(autouse=True)
+    def _clear_model_cache(self):
+        """Drop models cached by earlier tests, which used other YOLO mocks."""
+        _load_model.cache_clear()
+        yield
+        _load_model.cache_clear()
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_init_reuses_loaded_model(self, mock_yolo_class):
+        """Test detectors with the same weights share one loaded model."""
+        first = YOLODetector()
+        second = YOLODetector(confidence_threshold=0.5)
+
+        mock_yolo_class.assert_called_once_with("yolov8n.pt")
+        assert first.model is second.model
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_init_never_modifies_shared_model(self, mock_yolo_class):
+        """Test the shared CUDA model is fused once and CPU detectors get their own."""
+        mock_yolo_class.side_effect = lambda name: Mock()
+
+        with patch("src.yolo.yolo_detector.torch.cuda.is_available", return_value=True):
+            first = YOLODetector(precision="fp16")
+            second = YOLODetector(precision="fp16")
+        with patch(
+            "src.yolo.yolo_detector.torch.cuda.is_available", return_value=False
+        ):
+            cpu = YOLODetector()
+
+        assert first.model is second.model
+        first.model.to.assert_called_once_with("cuda")
+        first.model.fuse.assert_called_once()
+        assert cpu.model is not first.model
+        cpu.model.to.assert_not_called()
+        cpu.model.fuse.assert_not_called()
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_init_rejects_mismatched_cache(self, mock_yolo_class):
+        """Test a cache opened for other model settings is refused."""
+        cache = Mock(model_name="yolov8s.pt", imgsz=640, precision="fp32")
+
+        with pytest.raises(ValueError, match="Detection cache"):
+            YOLODetector(model_name="yolov8n.pt", precision="fp32", cache=cache)
+
     @patch("src.yolo.yolo_detector.YOLO")
     def test_init_default_model(self, mock_yolo_class):
         """Test initialization with default model."""
@@ -34,6 +79,14 @@ class TestYOLODetector:
         mock_yolo_class.assert_called_once_with("yolov8s.pt")
         assert detector.confidence_threshold == 0.5
 
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_init_invalid_precision(self, mock_yolo_class):
+        """Test that an unknown precision is rejected."""
+        with pytest.raises(ValueError, match="Unsupported precision"):
+            YOLODetector(precision="bf16")
+
+        mock_yolo_class.assert_not_called()
+
     @patch("src.yolo.yolo_detector.YOLO")
     def test_get_detection_summary(self, mock_yolo_class):
         """Test getting detection summary statistics."""
@@ -56,6 +109,37 @@ class TestYOLODetector:
         assert summary["class_counts"] == {"person": 2, "bottle": 1}
         assert summary["avg_confidence"] == pytest.approx(0.8)
 
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_get_detection_summary_large_batch(self, mock_yolo_class):
+        """Test that large detection lists are summarized the same way."""
+        detector = YOLODetector()
+        detections = [
+            {"class": "bottle", "confidence": 0.9},
+            {"class": "cup", "confidence": 0.5},
+        ] * 1000
+
+        summary = detector.get_detection_summary(detections)
+
+        assert summary["total_objects"] == 2000
+        assert summary["class_counts"] == {"bottle": 1000, "cup": 1000}
+        assert summary["avg_confidence"] == pytest.approx(0.7)
+        assert summary["high_confidence"] == 1000
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_get_detection_summary_keeps_first_seen_order(self, mock_yolo_class):
+        """Test that the array path lists classes in first-seen order."""
+        detector = YOLODetector()
+        detections = [
+            {"class": "cup", "confidence": 0.5},
+            {"class": "bottle", "confidence": 0.9},
+        ] * 50
+
+        summary = detector.get_detection_summary(detections)
+
+        assert summary["unique_classes"] == ["cup", "bottle"]
+        assert summary["class_counts"] == {"cup": 50, "bottle": 50}
+        assert summary["high_confidence"] == 50
+
     @patch("src.yolo.yolo_detector.YOLO")
     def test_get_detection_summary_empty(self, mock_yolo_class):
         """Test getting summary with no detections."""
@@ -70,6 +154,95 @@ class TestYOLODetector:
         assert summary["class_counts"] == {}
         assert summary["avg_confidence"] == 0.0
 
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_batch_detect_chunks_model_calls(self, mock_yolo_class, tmp_path):
+        """Test that batch_detect sends images to the model in chunks."""
+        image_paths = []
+        for name in ("1.jpg", "2.jpg", "3.jpg"):
+            image = tmp_path / name
+            image.write_bytes(b"fake")
+            image_paths.append(str(image))
+        missing = str(tmp_path / "missing.jpg")
+
+        empty_result = Mock(boxes=[], names={})
+        mock_model = Mock(
+            side_effect=lambda chunk, **kwargs: [empty_result] * len(chunk)
+        )
+        mock_yolo_class.return_value = mock_model
+        detector = YOLODetector(batch_size=2)
+        streamed = []
+
+        results = detector.batch_detect(
+            image_paths + [missing],
+            on_result=lambda path, dets: streamed.append(path),
+        )
+
+        assert list(results) == image_paths + [missing]
+        assert sorted(streamed) == sorted(results)
+        assert all(dets == [] for dets in results.values())
+        assert mock_model.call_count == 2
+        assert mock_model.call_args_list[0].args[0] == image_paths[:2]
+        assert mock_model.call_args_list[0].kwargs["stream"] is True
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_batch_detect_hashes_each_image_once(self, mock_yolo_class, tmp_path):
+        """Test a cache miss reuses the lookup's hash when storing results."""
+        from src.yolo.cache import DetectionCache
+
+        image = tmp_path / "1.jpg"
+        image.write_bytes(b"fake")
+        empty_result = Mock(boxes=[], names={})
+        mock_yolo_class.return_value = Mock(
+            side_effect=lambda chunk, **kwargs: [empty_result] * len(chunk)
+        )
+        cache = DetectionCache(str(tmp_path / "cache.sqlite"), "yolov8n.pt")
+        detector = YOLODetector(precision="fp32", cache=cache)
+
+        with patch.object(cache, "file_hash", wraps=cache.file_hash) as file_hash:
+            detector.batch_detect([str(image)])
+
+        assert file_hash.call_count == 1
+        assert cache.get(str(image), detector.confidence_threshold) == []
+        cache.close()
+
+    @patch("src.yolo.yolo_detector.YOLO")
+    def test_parse_result_reads_box_tensors_at_once(self, mock_yolo_class):
+        """Test that a Results object is converted to detection dicts."""
+
+        def tensor(values):
+            tensor = Mock()
+            tensor.cpu.return_value.numpy.return_value = np.array(
+                values, dtype=np.float32
+            )
+            return tensor
+
+        boxes = MagicMock()
+        boxes.__len__.return_value = 2
+        boxes.cls = tensor([0, 39])
+        boxes.conf = tensor([0.5, 0.25])
+        boxes.xyxy = tensor([[1, 2, 3, 4], [5, 6, 7, 8]])
+        result = Mock(boxes=boxes, names={0: "Person", 39: "bottle"})
+        detector = YOLODetector()
+
+        detections = detector._parse_result(result)
+
+        assert detections == [
+            {
+                "class": "Person",
+                "class_lower": "person",
+                "confidence": 0.5,
+                "bbox": [1.0, 2.0, 3.0, 4.0],
+                "class_id": 0,
+            },
+            {
+                "class": "bottle",
+                "class_lower": "bottle",
+                "confidence": 0.25,
+                "bbox": [5.0, 6.0, 7.0, 8.0],
+                "class_id": 39,
+            },
+        ]
+
 
 class TestImageClassifier:
     """Test suite for ImageClassifier class."""
@@ -195,3 +368,17 @@ class TestImageClassifier:
         assert stats["product_display"]["count"] == 1
         assert stats["lifestyle"]["count"] == 1
         assert stats["other"]["count"] == 1
+
+    def test_get_statistics_from_categories(self):
+        """Test statistics from precomputed categories match classifying again."""
+        classifier = ImageClassifier()
+        batch_results = {
+            "img1.jpg": [{"class": "bottle", "confidence": 0.9}],
+            "img2.jpg": [{"class": "person", "confidence": 0.9}],
+            "img3.jpg": [],
+        }
+        categories = classifier.classify_batch(batch_results)
+
+        stats = classifier.get_statistics_from_categories(categories)
+
+        assert stats == classifier.get_category_statistics(batch_results)